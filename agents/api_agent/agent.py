@@ -1,64 +1,122 @@
 """API Agent Node - LangGraph agent for CourtListener"""
+import contextvars
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Handle imports
 try:
     from ...state import AgentState
-    from .tools import search_courtlistener_api, scrape_document_page
+    from ... import budget
+    from ...http_client import FetchError
+    from ...logs import get_logger, logged_node, set_fields
+    from .tools import search_courtlistener_api, scrape_document_page, fetch_pdf_text
 except ImportError:
     parent_dir = str(Path(__file__).parent.parent.parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
-    from agents.api_agent.tools import search_courtlistener_api, scrape_document_page
+    import budget
+    from http_client import FetchError
+    from logs import get_logger, logged_node, set_fields
+    from agents.api_agent.tools import search_courtlistener_api, scrape_document_page, fetch_pdf_text
 
 
+log = get_logger("api_agent")
+
+
+@logged_node("api_agent")
+@budget.budgeted
 def api_agent_node(state: AgentState) -> AgentState:
     """
     API Agent Node - Uses tools to query CourtListener API.
     This agent communicates with other agents through shared state.
     """
-    print(f"\n{'='*60}")
-    print(f"🤖 API AGENT")
-    print(f"{'='*60}")
-    print("Agent activated. My tools:")
-    print(f"  - {search_courtlistener_api.name}")
-    print(f"  - {scrape_document_page.name}")
-    print()
+    log.debug("API agent activated")
     
     # Step 1: Use tool to search API
-    print("📋 Step 1: Searching CourtListener API...")
-    query_params = {"date_filed__gte": "2024-01-01", "court": "Supreme Court"}
-    documents = search_courtlistener_api.invoke({"query_params": query_params})
-    print(f"   ✅ Found {len(documents)} documents")
-    print()
+    court_id = state.get("court_id") or "scotus"
+    query_params = {"date_filed__gte": "2024-01-01", "court": court_id}
+    try:
+        documents = search_courtlistener_api.invoke({"query_params": query_params})
+    except budget.BudgetExceeded as e:
+        log.warning("Search shed, ending workflow: %s", e)
+        state["errors"].append(f"Search shed: {e}")
+        state["should_continue"] = False
+        return state
+    log.info("Found %d documents for court %s", len(documents), court_id)
     
     # Get first document
     doc = documents[0] if documents else {}
+    set_fields(entry_id=doc.get("url"))
     
-    # Step 2: Use tool to scrape document
-    print("📋 Step 2: Scraping document page...")
+    # Step 2: Fetch the document page and its PDF concurrently
     doc_url = doc.get("url", "https://courtlistener.com/case/12345")
-    scraped = scrape_document_page.invoke({"doc_url": doc_url})
-    print(f"   ✅ Content scraped ({len(scraped.get('content', ''))} chars)")
-    print()
+    pdf_url = doc.get("pdf_url")
+    # Not a with-block: leaving one would wait for the PDF even when the page failed and the run gives up
+    pool = ThreadPoolExecutor(max_workers=2)
+    pdf_future = None
+    try:
+        # Each fetch runs in a copy of this context so tools see the run budget
+        page_future = pool.submit(contextvars.copy_context().run, scrape_document_page.invoke, {"doc_url": doc_url})
+        if pdf_url:
+            pdf_future = pool.submit(contextvars.copy_context().run, fetch_pdf_text.invoke, {"pdf_url": pdf_url})
+        try:
+            scraped = page_future.result()
+        except budget.BudgetExceeded as e:
+            log.warning("Scrape shed, ending workflow: %s", e)
+            state["errors"].append(f"Scrape shed: {e}")
+            state["should_continue"] = False
+            return state
+        except FetchError as e:
+            # Slow or parked host - skip this document rather than stall the batch
+            log.error("Scrape failed, ending workflow: %s", e)
+            state["errors"].append(f"Scrape failed: {e}")
+            state["should_continue"] = False
+            return state
+        log.info("Scraped %s (%d chars)", doc_url, len(scraped.get("content", "")))
+        
+        # Search result had no PDF link - fall back to the one on the page
+        if pdf_future is None and scraped.get("pdf_url"):
+            pdf_url = scraped["pdf_url"]
+            pdf_future = pool.submit(contextvars.copy_context().run, fetch_pdf_text.invoke, {"pdf_url": pdf_url})
+        
+        # The page alone is still worth classifying if the PDF fails
+        pdf = {}
+        if pdf_future is not None:
+            try:
+                pdf = pdf_future.result()
+                log.info("Extracted PDF text from %s (%d pages, %d chars)", pdf_url, pdf["pages"], len(pdf["text"]),
+                         extra={"pdf_truncated": pdf["truncated"]})
+            except (budget.BudgetExceeded, FetchError) as e:
+                log.warning("PDF skipped: %s", e)
+                state["errors"].append(f"PDF skipped: {e}")
+            except Exception as e:
+                # Extraction or process-pool failure (e.g. BrokenProcessPool) - keep the page
+                log.error("PDF extraction failed: %s", e)
+                state["errors"].append(f"PDF skipped: {e}")
+    finally:
+        if pdf_future is not None:
+            pdf_future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
     
     # Update state (this is how agents communicate)
     state["source"] = "court_listener"
-    state["url"] = scraped.get("pdf_url", doc.get("url"))
+    state["url"] = pdf_url or doc.get("url")
     state["domain"] = "courtlistener.com"
     state["title"] = scraped.get("title")
     state["description"] = scraped.get("description")
-    state["content"] = scraped.get("content")
+    state["content"] = "\n\n".join(filter(None, [scraped.get("content"), pdf.get("text")]))
     state["metadata"] = {
         "case_name": doc.get("case_name"),
         "docket_id": doc.get("docket_id"),
-        "document_id": doc.get("document_id")
+        "document_id": doc.get("document_id"),
+        "court_id": court_id,
+        "pdf_pages": pdf.get("pages"),
+        "pdf_truncated": pdf.get("truncated")
     }
     state["current_agent"] = "api_agent"
     state["should_continue"] = True
     
-    print("📤 My work is done. Passing state to Classification Agent")
     return state
 
@@ -1,7 +1,62 @@
 """API Agent Tools - Using @tool decorator"""
 from langchain_core.tools import tool
 from typing import Dict, Any, List
+from urllib.parse import urljoin
+import functools
+import os
 import time
+import zlib
+
+try:
+    from ...cpu_pool import run_cpu_bound, run_in_pool
+    from ...extraction import extract_html_document, extract_pdf_file, extract_pdf_text
+    from ...http_client import get_http_client
+    from ... import budget
+    from ...logs import get_logger
+except ImportError:
+    from cpu_pool import run_cpu_bound, run_in_pool
+    from extraction import extract_html_document, extract_pdf_file, extract_pdf_text
+    from http_client import get_http_client
+    import budget
+    from logs import get_logger
+
+
+log = get_logger("api_agent.tools")
+
+
+DUMMY_DOCUMENT_HTML = """<html>
+<head>
+  <title>State v. Insurance Company</title>
+  <meta name="description" content="Court case 2024-CL-001 filed on 2024-01-15">
+</head>
+<body>
+  <nav>Home | Search | Dockets | Sign in</nav>
+  <article>
+    <p>This is dummy pre-scraped content from the court document. It contains information about insurance regulations and legal precedents that may impact the industry.</p>
+    <a href="/pdf/12345.pdf">Download PDF</a>
+  </article>
+  <footer>Free Law Project</footer>
+</body>
+</html>"""
+
+
+def _build_dummy_pdf(pages: List[str]) -> bytes:
+    """Minimal PDF with one Flate-compressed content stream per page (no xref - enough for the stand-in)."""
+    parts = [b"%PDF-1.4\n"]
+    for number, text in enumerate(pages, start=1):
+        ops = b"BT /F1 11 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        stream = zlib.compress(ops)
+        parts.append(b"%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n" % (number, len(stream)))
+        parts.append(stream + b"\nendstream\nendobj\n")
+    parts.append(b"%%EOF\n")
+    return b"".join(parts)
+
+
+DUMMY_DOCUMENT_PDF = _build_dummy_pdf([
+    "IN THE SUPREME COURT. State v. Insurance Company, No. 2024-CL-001.",
+    "The insurer challenges the state regulation of premium rates for commercial property coverage.",
+    "Held: the regulation applies to policies issued after January 1, 2024.",
+])
 
 
 @tool
@@ -13,10 +68,11 @@ def search_courtlistener_api(query_params: Dict[str, Any]) -> List[Dict[str, Any
         query_params: Dictionary with search parameters (date_filed__gte, court, etc.)
     
     Returns:
-        List of document dictionaries with case_name, docket_id, document_id, url
+        List of document dictionaries with case_name, docket_id, document_id, url, pdf_url
     """
-    print(f"  🔧 TOOL: search_courtlistener_api({query_params})")
-    time.sleep(0.3)
+    log.debug("search_courtlistener_api(%s)", query_params)
+    timeout = budget.current().call_timeout(30.0)
+    time.sleep(min(0.3, timeout))
     
     # Dummy response
     return [
@@ -24,7 +80,8 @@ def search_courtlistener_api(query_params: Dict[str, Any]) -> List[Dict[str, Any
             "case_name": "State v. Insurance Company",
             "docket_id": "2024-CL-001",
             "document_id": "doc-12345",
-            "url": "https://courtlistener.com/case/12345"
+            "url": "https://courtlistener.com/case/12345",
+            "pdf_url": "https://courtlistener.com/pdf/12345.pdf"
         }
     ]
 
@@ -39,15 +96,70 @@ def scrape_document_page(doc_url: str) -> Dict[str, Any]:
     
     Returns:
         Dictionary with title, description, content, and pdf_url
+    
+    Raises:
+        FetchError: The page could not be fetched or its host is parked
     """
-    print(f"  🔧 TOOL: scrape_document_page(doc_url='{doc_url}')")
-    time.sleep(0.4)
+    log.debug("scrape_document_page(doc_url=%s)", doc_url)
+    # Hedged fetch with per-host adaptive timeout and circuit breaker
+    html = get_http_client().get(doc_url)
     
-    # Dummy response
+    # Dummy backend returns an empty body - in real implementation, this is the fetched page
+    html = html or DUMMY_DOCUMENT_HTML
+    
+    # Boilerplate stripping is CPU-bound - large pages go to the process pool
+    extracted = run_cpu_bound(extract_html_document, html)
+    pdf_links = extracted["pdf_links"]
     return {
-        "title": "State v. Insurance Company",
-        "description": "Court case 2024-CL-001 filed on 2024-01-15",
-        "content": "This is dummy pre-scraped content from the court document. It contains information about insurance regulations and legal precedents that may impact the industry.",
-        "pdf_url": "https://courtlistener.com/pdf/12345.pdf"
+        "title": extracted["title"],
+        "description": extracted["description"],
+        "content": extracted["content"],
+        "pdf_url": urljoin(doc_url, pdf_links[0]) if pdf_links else None
     }
 
+
+@tool
+def fetch_pdf_text(pdf_url: str) -> Dict[str, Any]:
+    """
+    Download a filing PDF and extract its text page by page.
+    
+    The PDF streams into a spool that moves to a named temp file past
+    PDF_SPOOL_BYTES, so large filings are never held in memory whole.
+    Extraction runs in the process pool; for an on-disk spool the worker
+    opens that file by path and reads it through mmap. Reading stops at PDF_MAX_BYTES downloaded, PDF_MAX_PAGES
+    pages or PDF_MAX_CHARS of text.
+    
+    Args:
+        pdf_url: URL of the PDF
+    
+    Returns:
+        Dictionary with text, pages, bytes and truncated
+    
+    Raises:
+        FetchError: The PDF could not be fetched or its host is parked
+    """
+    log.debug("fetch_pdf_text(pdf_url=%s)", pdf_url)
+    spool_bytes = int(os.getenv("PDF_SPOOL_BYTES", str(1024 * 1024)))
+    spool, size, truncated = get_http_client().download(
+        pdf_url,
+        max_bytes=int(os.getenv("PDF_MAX_BYTES", str(50 * 1024 * 1024))),
+        spool_bytes=spool_bytes,
+    )
+    with spool:
+        if size == 0:
+            # Dummy backend returns an empty body - in real implementation, this is the fetched PDF
+            spool.write(DUMMY_DOCUMENT_PDF)
+            spool.flush()
+            spool.seek(0)
+            size = len(DUMMY_DOCUMENT_PDF)
+        max_pages = int(os.getenv("PDF_MAX_PAGES", "50"))
+        max_chars = int(os.getenv("PDF_MAX_CHARS", "200000"))
+        if spool.name is None:
+            # Still in memory - ship the bytes (inline when small)
+            extract = functools.partial(extract_pdf_text, max_pages=max_pages, max_chars=max_chars)
+            extracted = run_cpu_bound(extract, spool.read())
+        else:
+            extracted = run_in_pool(extract_pdf_file, spool.name, max_pages, max_chars)
+    extracted["bytes"] = size
+    extracted["truncated"] = extracted["truncated"] or truncated
+    return extracted
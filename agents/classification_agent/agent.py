@@ -5,45 +5,105 @@ from pathlib import Path
 # Handle imports
 try:
     from ...state import AgentState
-    from .tools import classify_content
+    from ... import budget
+    from ...logs import get_logger, logged_node
+    from .tools import classify_content, find_near_duplicate, enrich_naics_codes
+    from ...cpu_pool import run_cpu_bound
+    from ...extraction import normalize_content
 except ImportError:
     parent_dir = str(Path(__file__).parent.parent.parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
-    from agents.classification_agent.tools import classify_content
+    import budget
+    from logs import get_logger, logged_node
+    from agents.classification_agent.tools import classify_content, find_near_duplicate, enrich_naics_codes
+    from cpu_pool import run_cpu_bound
+    from extraction import normalize_content
 
 
+log = get_logger("classification_agent")
+
+# Content kept when long documents are trimmed near the deadline/budget
+FIRST_CHUNK_CHARS = 4000
+
+
+def _shed_classification(state: AgentState, reason: str) -> AgentState:
+    """Skip classification; storage still saves the record, marked partial."""
+    log.warning("Classification shed, passing unclassified state to Storage Agent: %s", reason)
+    state["classification"] = None
+    state["errors"].append(f"Classification shed: {reason}")
+    state["current_agent"] = "classification"
+    state["should_continue"] = True
+    return state
+
+
+@logged_node("classification")
+@budget.budgeted
 def classification_agent_node(state: AgentState) -> AgentState:
     """
     Classification Agent Node - Uses tools to classify content.
     This agent receives state from API Agent and passes to Storage Agent.
     """
-    print(f"\n{'='*60}")
-    print(f"🤖 CLASSIFICATION AGENT")
-    print(f"{'='*60}")
-    print("Agent activated. My tools:")
-    print(f"  - {classify_content.name}")
-    print()
-    print(f"📥 Received state from: {state.get('current_agent', 'unknown')}")
-    print(f"📊 Content to process: {len(state.get('content', ''))} chars")
-    print()
+    log.debug("Received state from %s (%d chars)", state.get("current_agent", "unknown"), len(state.get("content") or ""))
+    
+    # Source agent stopped early (no concerns, not modified, shed)
+    if not state.get("should_continue", True):
+        log.debug("Nothing to classify, passing state through")
+        return state
+    
+    # Normalize once so fingerprints and prompts see the same text
+    content = run_cpu_bound(normalize_content, state.get("content") or "")
+    state["content"] = content
+    
+    # Near-duplicate stage: syndicated copies reuse the original classification
+    if state.get("duplicate_check_enabled") and not state.get("skip_duplicate_check"):
+        lookup = find_near_duplicate.invoke({"content": content})
+        state["content_fingerprint"] = lookup["fingerprint"]
+        match = lookup["match"]
+        if match and match.get("classification"):
+            log.info("Near-duplicate of %s (distance %d), reusing classification", match["url"], match["distance"])
+            state["classification"] = match["classification"]
+            state["duplicate_of"] = {
+                "url": match["url"],
+                "s3_key": match["s3_key"],
+                "fingerprint": match["fingerprint"],
+                "distance": match["distance"],
+            }
+            state["current_agent"] = "classification"
+            state["should_continue"] = True
+            return state
+    
+    # Near the deadline/budget: classify only the first chunk of long documents
+    run_budget = budget.current()
+    if run_budget.should_shed(budget.LOW) and len(content) > FIRST_CHUNK_CHARS:
+        log.warning("Near deadline/budget, classifying first %d chars only", FIRST_CHUNK_CHARS)
+        content = content[:FIRST_CHUNK_CHARS]
+    
+    # Past it: skip the LLM and let storage save a partial record
+    if run_budget.should_shed(budget.NORMAL):
+        return _shed_classification(state, "deadline/budget reached")
     
     # Use tool to classify
-    print("📋 Classifying content...")
-    content = state.get("content", "")
-    classification = classify_content.invoke({"content": content})
-    print(f"   ✅ Classification complete:")
-    print(f"      - Tag: {classification['tag']}")
-    print(f"      - Risks: {classification['risks']}")
-    print(f"      - NAICS: {classification['naics_codes']}")
-    print()
+    try:
+        classification = classify_content.invoke({"content": content})
+    except (budget.BudgetExceeded, TimeoutError) as e:
+        return _shed_classification(state, str(e))
+    
+    # Validate NAICS codes and attach titles + parent hierarchy
+    naics = enrich_naics_codes.invoke({"codes": classification.get("naics_codes", [])})
+    classification.update(naics)
+    if naics["invalid_naics_codes"]:
+        log.warning("Dropped invalid NAICS codes: %s", naics["invalid_naics_codes"])
+    if naics["unknown_naics_codes"]:
+        log.info("NAICS codes not in the local taxonomy: %s", naics["unknown_naics_codes"])
+    log.info("Classified as %s", classification["tag"],
+             extra={"risks": classification["risks"], "naics_codes": classification["naics_codes"]})
     
     # Update state (this is how agents communicate)
     state["classification"] = classification
     state["current_agent"] = "classification"
     state["should_continue"] = True
     
-    print("📤 My work is done. Passing state to Storage Agent")
     return state
 
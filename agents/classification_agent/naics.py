@@ -0,0 +1,109 @@
+"""NAICS Taxonomy - prefix index for validating and enriching NAICS codes"""
+import csv
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+DEFAULT_NAICS_PATH = str(Path(__file__).parent / "naics_codes.csv")
+
+
+class NaicsIndex:
+    """
+    NAICS codes indexed by prefix.
+
+    Every level of the hierarchy is a prefix of the full code (sector = 2
+    digits ... national industry = 6 digits), so validation and parent
+    expansion are one hash lookup per prefix - O(code length).
+    Ranged sectors ("31-33") are indexed under each of their 2-digit codes.
+    """
+
+    def __init__(self, titles: Dict[str, str]):
+        self._titles: Dict[str, str] = {}
+        self._sector_labels: Dict[str, str] = {}
+        for code, title in titles.items():
+            if "-" in code:
+                low, high = code.split("-")
+                for sector in range(int(low), int(high) + 1):
+                    self._titles[str(sector)] = title
+                    self._sector_labels[str(sector)] = code
+            else:
+                self._titles[code] = title
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def title(self, code: str) -> Optional[str]:
+        return self._titles.get(code)
+
+    @staticmethod
+    def is_well_formed(code: str) -> bool:
+        return code.isdigit() and 2 <= len(code) <= 6
+
+    def is_valid(self, code: str) -> bool:
+        return self.is_well_formed(code) and code in self._titles
+
+    def hierarchy(self, code: str) -> List[Dict[str, str]]:
+        """Known ancestors of code, sector first, ending with the code itself."""
+        levels = []
+        for length in range(2, len(code) + 1):
+            prefix = code[:length]
+            title = self._titles.get(prefix)
+            if title is not None:
+                label = self._sector_labels.get(prefix, prefix) if length == 2 else prefix
+                levels.append({"code": label, "title": title})
+        return levels
+
+    def enrich(self, codes: List[str]) -> Dict[str, Any]:
+        """
+        Validate codes and expand each to its titled hierarchy.
+
+        Well-formed codes missing from the taxonomy (the bundled table is
+        partial) are kept, with whatever ancestors are known, and reported
+        as unknown; only malformed codes are dropped.
+
+        Returns:
+            Dictionary with kept codes, unknown codes, invalid (dropped) codes
+            and per-code details
+        """
+        kept: List[str] = []
+        unknown: List[str] = []
+        invalid: List[str] = []
+        details: List[Dict[str, Any]] = []
+        for raw in codes:
+            code = str(raw).strip()
+            if self.is_well_formed(code):
+                if code not in kept:
+                    kept.append(code)
+                    if code not in self._titles:
+                        unknown.append(code)
+                    details.append({
+                        "code": code,
+                        "title": self._titles.get(code),
+                        "hierarchy": self.hierarchy(code),
+                    })
+            elif code not in invalid:
+                invalid.append(code)
+        return {"naics_codes": kept, "unknown_naics_codes": unknown, "invalid_naics_codes": invalid, "naics": details}
+
+
+def load_naics_index(path: str) -> NaicsIndex:
+    """Build the index from a CSV file with code,title columns."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        titles = {row["code"].strip(): row["title"].strip() for row in csv.DictReader(f)}
+    return NaicsIndex(titles)
+
+
+_index: Optional[NaicsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_naics_index() -> NaicsIndex:
+    """Return the process-wide NAICS index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_naics_index(os.getenv("NAICS_TAXONOMY_PATH", DEFAULT_NAICS_PATH))
+    return _index
@@ -0,0 +1,216 @@
+"""Near-Duplicate Index - SimHash fingerprints of recently classified content"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 8  # 8 bands x 8 bits - any match within 7 bits shares a band
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+MAX_HAMMING_DISTANCE = 6
+MIN_TOKENS = 8  # Shorter texts are too generic to fingerprint safely
+SHINGLE_SIZE = 2
+
+DEFAULT_INDEX_PATH = ".cache/near_duplicates.sqlite"
+DEFAULT_RETENTION_DAYS = 7
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash over word shingles.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        Fingerprint as int, or None if the text is too short to fingerprint
+    """
+    tokens = _tokens(text)
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    weights = [0] * FINGERPRINT_BITS
+    for i in range(len(tokens) - SHINGLE_SIZE + 1):
+        shingle = " ".join(tokens[i:i + SHINGLE_SIZE]).encode("utf-8")
+        h = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BAND_COUNT)]
+
+
+def _to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+
+
+def _from_signed(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateIndex:
+    """
+    Persistent SimHash index of recently processed content.
+
+    Fingerprints are split into bands so a lookup only compares against
+    records sharing at least one band, instead of scanning the whole index.
+    Safe to share across threads; SQLite WAL mode lets several processes
+    use the same file.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, retention_days: float = DEFAULT_RETENTION_DAYS):
+        self.path = path
+        self.retention_seconds = retention_days * 86400
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                fingerprint INTEGER PRIMARY KEY,
+                url TEXT,
+                title TEXT,
+                source TEXT,
+                s3_key TEXT,
+                classification TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                fingerprint INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bands ON bands (band, value);
+            CREATE INDEX IF NOT EXISTS idx_records_created ON records (created_at);
+            """
+        )
+        self._conn.commit()
+
+    def find(self, fingerprint: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest recent record within MAX_HAMMING_DISTANCE bits.
+
+        Returns:
+            Record dictionary (with parsed classification and distance), or None
+        """
+        cutoff = time.time() - self.retention_seconds
+        clauses = " OR ".join(["(b.band = ? AND b.value = ?)"] * BAND_COUNT)
+        params: List[Any] = []
+        for band, value in enumerate(_bands(fingerprint)):
+            params.extend([band, value])
+        params.append(cutoff)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT DISTINCT r.fingerprint, r.url, r.title, r.source, r.s3_key,
+                       r.classification, r.created_at
+                FROM bands b JOIN records r ON r.fingerprint = b.fingerprint
+                WHERE ({clauses}) AND r.created_at >= ?
+                """,
+                params,
+            ).fetchall()
+
+        best = None
+        for row in rows:
+            distance = hamming_distance(fingerprint, _from_signed(row[0]))
+            if distance <= MAX_HAMMING_DISTANCE and (best is None or distance < best["distance"]):
+                best = {
+                    "fingerprint": format(_from_signed(row[0]), "016x"),
+                    "url": row[1],
+                    "title": row[2],
+                    "source": row[3],
+                    "s3_key": row[4],
+                    "classification": json.loads(row[5]) if row[5] else None,
+                    "created_at": row[6],
+                    "distance": distance,
+                }
+        return best
+
+    def add(self, fingerprint: int, record: Dict[str, Any]) -> None:
+        """
+        Add or refresh a processed record.
+
+        Args:
+            fingerprint: SimHash of the record content
+            record: Dictionary with url, title, source, s3_key, classification
+        """
+        signed = _to_signed(fingerprint)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    signed,
+                    record.get("url"),
+                    record.get("title"),
+                    record.get("source"),
+                    record.get("s3_key"),
+                    json.dumps(record.get("classification")),
+                    time.time(),
+                ),
+            )
+            self._conn.execute("DELETE FROM bands WHERE fingerprint = ?", (signed,))
+            self._conn.executemany(
+                "INSERT INTO bands VALUES (?, ?, ?)",
+                [(band, value, signed) for band, value in enumerate(_bands(fingerprint))],
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Drop records older than the retention window. Returns rows removed."""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM records WHERE created_at < ?", (cutoff,)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM bands WHERE fingerprint NOT IN (SELECT fingerprint FROM records)"
+            )
+            self._conn.commit()
+        return removed
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Return the process-wide index, opening (and pruning) it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = NearDuplicateIndex(
+                    path=os.getenv("NEAR_DUP_INDEX_PATH", DEFAULT_INDEX_PATH),
+                    retention_days=float(os.getenv("NEAR_DUP_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)),
+                )
+                index.prune()
+                _index = index
+    return _index
@@ -1,7 +1,19 @@
 """Classification Agent Tools - Using @tool decorator"""
 from langchain_core.tools import tool
-from typing import Dict, Any
-import time
+from typing import Dict, Any, List, Optional
+
+from .near_duplicate import simhash, get_near_duplicate_index
+from .naics import get_naics_index
+
+try:
+    from ...llm_client import get_llm_client
+    from ...logs import get_logger
+except ImportError:
+    from llm_client import get_llm_client
+    from logs import get_logger
+
+
+log = get_logger("classification_agent.tools")
 
 
 @tool
@@ -15,11 +27,11 @@ def classify_content(content: str) -> Dict[str, Any]:
     Returns:
         Dictionary with classification results (tag, risks, naics, etc.)
     """
-    print(f"  🔧 TOOL: classify_content(content_length={len(content)})")
-    print(f"      🤖 [DUMMY LLM CALL] Classifying content...")
-    time.sleep(0.5)
+    log.debug("classify_content(content_length=%d)", len(content))
+    # Shared client applies rate limits and adaptive concurrency
+    get_llm_client().invoke(f"CLASSIFICATION_PROMPT\n{content}", max_tokens=1024)
     
-    # Dummy classification
+    # Dummy classification - in real implementation, would parse the model output
     return {
         "tag": "Current",
         "risks": ["Climate Risk", "Regulatory Compliance"],
@@ -27,3 +39,42 @@ def classify_content(content: str) -> Dict[str, Any]:
         "summary": "Article discusses insurance regulations related to climate risk."
     }
 
+
+
+@tool
+def find_near_duplicate(content: str) -> Dict[str, Any]:
+    """
+    Look up recently processed content that is a near-duplicate (SimHash).
+    Syndicated stories with small edits match here, so the earlier
+    classification can be reused instead of calling the LLM again.
+    
+    Args:
+        content: Text content to fingerprint
+    
+    Returns:
+        Dictionary with fingerprint (hex or None) and match (original record or None)
+    """
+    log.debug("find_near_duplicate(content_length=%d)", len(content))
+    fingerprint = simhash(content)
+    if fingerprint is None:
+        return {"fingerprint": None, "match": None}
+    
+    match: Optional[Dict[str, Any]] = get_near_duplicate_index().find(fingerprint)
+    return {"fingerprint": format(fingerprint, "016x"), "match": match}
+
+
+@tool
+def enrich_naics_codes(codes: List[str]) -> Dict[str, Any]:
+    """
+    Validate NAICS codes against the local taxonomy and attach titles.
+    
+    Args:
+        codes: NAICS codes returned by the classifier
+    
+    Returns:
+        Dictionary with naics_codes (well-formed codes), unknown_naics_codes
+        (well-formed but not in the taxonomy), invalid_naics_codes (dropped),
+        and naics (per-code title and parent hierarchy)
+    """
+    log.debug("enrich_naics_codes(codes=%s)", codes)
+    return get_naics_index().enrich(codes)
@@ -5,27 +5,40 @@ from pathlib import Path
 # Handle imports
 try:
     from ...state import AgentState
+    from ... import budget
+    from ...logs import get_logger, logged_node, set_fields
     from .tools import (
         fetch_rss_feed,
         parse_rss_feed,
         is_valid_url,
+        prefilter_concern,
         check_concern_with_llm,
         extract_domain
     )
+    from ...tooling import run_tool
 except ImportError:
     parent_dir = str(Path(__file__).parent.parent.parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
+    import budget
+    from logs import get_logger, logged_node, set_fields
     from agents.rss_agent.tools import (
         fetch_rss_feed,
         parse_rss_feed,
         is_valid_url,
+        prefilter_concern,
         check_concern_with_llm,
         extract_domain
     )
+    from tooling import run_tool
 
 
+log = get_logger("rss_agent")
+
+
+@logged_node("rss_agent")
+@budget.budgeted
 def rss_agent_node(state: AgentState) -> AgentState:
     """
     RSS Agent Node - Uses tools to fetch and process RSS feeds.
@@ -36,40 +49,45 @@ def rss_agent_node(state: AgentState) -> AgentState:
     2. Parse RSS entries
     3. For each entry:
        - Validate URL
-       - LLM pre-filter (check concerns)
+       - Taxonomy prefilter, then LLM check for ambiguous entries
        - Build metadata
        - Pass to next agent (Content Extraction/Classification)
     """
-    print(f"\n{'='*60}")
-    print(f"🤖 RSS AGENT")
-    print(f"{'='*60}")
-    print("Agent activated. My tools:")
-    print(f"  - {fetch_rss_feed.name}")
-    print(f"  - {parse_rss_feed.name}")
-    print(f"  - {is_valid_url.name}")
-    print(f"  - {check_concern_with_llm.name}")
-    print(f"  - {extract_domain.name}")
-    print()
+    log.debug("RSS agent activated")
     
     # Get feed URL from state (could come from config or scheduler)
     feed_url = state.get("feed_url", "https://example.com/feed.rss")
     feed_name = state.get("feed_name", "default-feed")
     
     # Step 1: Fetch RSS feed
-    print("📋 Step 1: Fetching RSS feed...")
-    feed_data = fetch_rss_feed.invoke({"feed_url": feed_url})
-    print(f"   ✅ Fetched feed from {feed_data['domain']}")
-    print()
+    try:
+        feed_data = fetch_rss_feed.invoke({"feed_url": feed_url})
+    except budget.BudgetExceeded as e:
+        log.warning("Fetch shed, ending workflow: %s", e)
+        state["errors"].append(f"Fetch shed: {e}")
+        state["should_continue"] = False
+        return state
+    log.info("Fetched feed %s from %s", feed_url, feed_data["domain"])
+    
+    if feed_data.get("not_modified"):
+        log.info("Feed not modified since last poll, ending workflow")
+        state["feed_poll"] = {"not_modified": True, "entries": []}
+        state["should_continue"] = False
+        return state
     
     # Step 2: Parse RSS entries
-    print("📋 Step 2: Parsing RSS entries...")
     entries = parse_rss_feed.invoke({"xml_content": feed_data["xml_content"]})
-    print(f"   ✅ Found {len(entries)} entries")
-    print()
+    log.info("Parsed %d entries", len(entries))
+    
+    # Poll outcome for the scheduler's adaptive polling
+    state["feed_poll"] = {
+        "not_modified": False,
+        "entries": [{"link": e.get("link"), "published": e.get("published")} for e in entries]
+    }
     
     # Step 3: Process first entry (for demo - in real flow, would process all)
     if not entries:
-        print("   ⚠️ No entries found, ending workflow")
+        log.info("No entries found, ending workflow")
         state["should_continue"] = False
         return state
     
@@ -77,34 +95,46 @@ def rss_agent_node(state: AgentState) -> AgentState:
     link = entry.get("link", "")
     title = entry.get("title", "")
     description = entry.get("description", "")
+    set_fields(entry_id=link)
     
     # Step 4: Validate URL
-    print(f"📋 Step 3: Validating URL...")
-    if not is_valid_url.invoke({"url": link}):
-        print(f"   ❌ Invalid URL: {link}")
+    if not run_tool(is_valid_url, {"url": link}):
+        log.info("Invalid URL, skipping entry: %s", link)
         state["should_continue"] = False
         return state
-    print(f"   ✅ URL valid: {link}")
-    print()
     
-    # Step 5: LLM pre-filter (check concerns)
-    print(f"📋 Step 4: Checking concerns with LLM...")
-    has_concerns = check_concern_with_llm.invoke({
+    # Step 5: Concern cascade - taxonomy prefilter, LLM only when ambiguous
+    prefilter = prefilter_concern.invoke({
         "title": title,
         "description": description
     })
+    log.debug("Prefilter verdict %s", prefilter["verdict"], extra={"score": prefilter["score"], "terms": prefilter["terms"]})
+    if prefilter["verdict"] == "negative":
+        has_concerns = False
+    elif prefilter["verdict"] == "positive":
+        has_concerns = True
+    elif budget.current().should_shed(budget.NORMAL):
+        # Near the deadline/budget an unconfirmed entry isn't worth an LLM call
+        log.warning("Near deadline/budget, skipping LLM check for ambiguous entry")
+        state["errors"].append(f"Concern check shed: {link}")
+        has_concerns = False
+    else:
+        try:
+            has_concerns = check_concern_with_llm.invoke({
+                "title": title,
+                "description": description
+            })
+        except (budget.BudgetExceeded, TimeoutError) as e:
+            log.warning("Concern check shed: %s", e)
+            state["errors"].append(f"Concern check shed: {e}")
+            has_concerns = False
     if not has_concerns:
-        print(f"   ❌ No concerns found, skipping article")
+        log.info("No concerns found, skipping article")
         state["should_continue"] = False
         return state
-    print(f"   ✅ Concerns found, proceeding")
-    print()
     
     # Step 6: Extract domain for queuing
-    print(f"📋 Step 5: Extracting domain...")
-    domain = extract_domain.invoke({"url": link})
-    print(f"   ✅ Domain: {domain}")
-    print()
+    domain = run_tool(extract_domain, {"url": link})
     
     # Update state (this is how agents communicate)
     state["source"] = "rss-feed"
@@ -118,12 +148,16 @@ def rss_agent_node(state: AgentState) -> AgentState:
     state["metadata"] = {
         "title": title,
         "rss_name": feed_name,
-        "published": entry.get("published")
+        "published": entry.get("published"),
+        "concern_hints": {
+            "risks": prefilter["risks"],
+            "naics_hints": prefilter["naics_hints"]
+        }
     }
     state["pre_scraped_content"] = None  # RSS doesn't pre-scrape
     state["current_agent"] = "rss_agent"
     state["should_continue"] = True
     
-    print("📤 My work is done. Passing state to Classification Agent")
+    log.info("Concerns found, passing entry to Classification Agent")
     return state
 
@@ -0,0 +1,156 @@
+"""Concern Verdict Cache - TTL cache of LLM concern checks with in-flight dedup"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = ".cache/concern_verdicts.sqlite"
+DEFAULT_TTL_HOURS = 24
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial re-poll differences hit the cache."""
+    return _WS_RE.sub(" ", (text or "").lower()).strip()
+
+
+def cache_key(title: str, description: str, prompt_version: str) -> str:
+    raw = "\x1f".join([prompt_version, normalize_text(title), normalize_text(description)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ConcernVerdictCache:
+    """
+    Concern verdicts keyed on normalized title+description and prompt version.
+
+    An in-memory layer sits in front of a local SQLite file, so verdicts
+    survive restarts and are shared by every run in the process. Concurrent
+    lookups of the same key wait on a single in-flight computation.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_HOURS * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Tuple[bool, float]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                verdict INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM verdicts WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+
+    def _lookup(self, key: str) -> Optional[bool]:
+        # Caller holds self._lock
+        now = time.time()
+        hit = self._memory.get(key)
+        if hit is not None:
+            if hit[1] >= now:
+                return hit[0]
+            del self._memory[key]
+        row = self._conn.execute(
+            "SELECT verdict, expires_at FROM verdicts WHERE key = ? AND expires_at >= ?",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        self._memory[key] = (bool(row[0]), row[1])
+        return bool(row[0])
+
+    def _store(self, key: str, verdict: bool) -> None:
+        # Caller holds self._lock
+        expires_at = time.time() + self.ttl_seconds
+        self._memory[key] = (verdict, expires_at)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+            (key, int(verdict), expires_at),
+        )
+        self._conn.commit()
+
+    def get_or_compute(
+        self,
+        title: str,
+        description: str,
+        prompt_version: str,
+        compute: Callable[[], bool],
+        retry_on: Tuple[type, ...] = (),
+    ) -> bool:
+        """
+        Return the cached verdict, or compute it once and cache it.
+
+        Args:
+            title: Article title
+            description: Article description
+            prompt_version: Version of the concern prompt (part of the key)
+            compute: Zero-argument callable making the actual LLM check
+            retry_on: Failures specific to the computing caller (its deadline
+                or budget); a waiter seeing one computes under its own instead
+
+        Returns:
+            Concern verdict
+        """
+        key = cache_key(title, description, prompt_version)
+        while True:
+            with self._lock:
+                cached = self._lookup(key)
+                if cached is not None:
+                    return cached
+                future = self._in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._in_flight[key] = future
+            if owner:
+                break
+            try:
+                return future.result()
+            except retry_on:
+                continue
+
+        try:
+            verdict = bool(compute())
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, verdict)
+            del self._in_flight[key]
+        future.set_result(verdict)
+        return verdict
+
+
+_cache: Optional[ConcernVerdictCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_concern_cache() -> ConcernVerdictCache:
+    """Return the process-wide verdict cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ConcernVerdictCache(
+                    path=os.getenv("CONCERN_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    ttl_seconds=float(os.getenv("CONCERN_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600,
+                )
+    return _cache
@@ -0,0 +1,141 @@
+"""Concern Prefilter - compiled multi-pattern (Aho-Corasick) taxonomy matcher"""
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+DEFAULT_TAXONOMY_PATH = str(Path(__file__).parent / "concern_taxonomy.json")
+
+# Cascade verdicts
+NEGATIVE = "negative"  # No taxonomy term - drop without an LLM call
+POSITIVE = "positive"  # Strong evidence - fast-track without an LLM call
+AMBIGUOUS = "ambiguous"  # Weak evidence only - let the LLM decide
+
+
+class ConcernMatcher:
+    """
+    Aho-Corasick automaton over a taxonomy of insurance terms.
+
+    Built once; matching is a single pass over the text, so cost depends on
+    text length rather than the number of terms. Matches only count on word
+    boundaries ("risk" does not match inside "brisket").
+    """
+
+    def __init__(self, terms: List[Dict[str, Any]], positive_threshold: float = 1.0):
+        self.terms = terms
+        self.positive_threshold = positive_threshold
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for term_id, term in enumerate(terms):
+            self._insert(term["term"].lower(), term_id)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, term_id: int) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(term_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[int]:
+        """Return ids of distinct taxonomy terms found in text."""
+        text = text.lower()
+        goto, fail, output, terms = self._goto, self._fail, self._output, self.terms
+        found = set()
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            after_ok = end + 1 == len(text) or not text[end + 1].isalnum()
+            if not after_ok:
+                continue
+            for term_id in output[node]:
+                start = end - len(terms[term_id]["term"]) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.add(term_id)
+        return sorted(found)
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Run the prefilter cascade on text.
+
+        Returns:
+            Dictionary with verdict, score, matched terms, risks and NAICS hints
+        """
+        matched = [self.terms[term_id] for term_id in self.find(text)]
+        score = sum(term.get("weight", 1.0) for term in matched)
+        if not matched:
+            verdict = NEGATIVE
+        elif score >= self.positive_threshold:
+            verdict = POSITIVE
+        else:
+            verdict = AMBIGUOUS
+
+        risks: List[str] = []
+        naics_hints: List[str] = []
+        for term in matched:
+            risks.extend(r for r in term.get("risks", []) if r not in risks)
+            naics_hints.extend(n for n in term.get("naics", []) if n not in naics_hints)
+
+        return {
+            "verdict": verdict,
+            "score": score,
+            "terms": [term["term"] for term in matched],
+            "risks": risks,
+            "naics_hints": naics_hints,
+        }
+
+
+def load_taxonomy(path: str) -> ConcernMatcher:
+    """
+    Build a matcher from a taxonomy JSON file.
+
+    The file holds {"positive_threshold": float, "terms": [{"term", "weight",
+    "risks", "naics"}, ...]}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return ConcernMatcher(
+        terms=taxonomy["terms"],
+        positive_threshold=taxonomy.get("positive_threshold", 1.0),
+    )
+
+
+_matcher: Optional[ConcernMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_concern_matcher() -> ConcernMatcher:
+    """Return the process-wide matcher, compiling the taxonomy on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = load_taxonomy(os.getenv("CONCERN_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+    return _matcher
@@ -4,6 +4,50 @@ from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse
 import time
 
+from .prefilter import get_concern_matcher
+from .concern_cache import get_concern_cache
+
+try:
+    from ...llm_client import get_llm_client
+    from ...cpu_pool import run_cpu_bound
+    from ...extraction import parse_feed_xml
+    from ...tooling import pure_tool
+    from ... import budget
+    from ...logs import get_logger
+except ImportError:
+    from llm_client import get_llm_client
+    from cpu_pool import run_cpu_bound
+    from extraction import parse_feed_xml
+    from tooling import pure_tool
+    import budget
+    from logs import get_logger
+
+
+log = get_logger("rss_agent.tools")
+
+
+DUMMY_FEED_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Example Feed</title>
+    <item>
+      <title>Insurance Regulation Update 2024</title>
+      <description>New regulations affecting insurance companies in 2024</description>
+      <link>https://example.com/article1</link>
+      <pubDate>Mon, 15 Jan 2024 10:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Climate Risk Assessment Guidelines</title>
+      <description>New guidelines for assessing climate-related risks</description>
+      <link>https://example.com/article2</link>
+      <pubDate>Sun, 14 Jan 2024 15:30:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>"""
+
+# Bump when CONCERN_CHECK_FOR_RSS_PROMPT changes so cached verdicts are not reused
+CONCERN_PROMPT_VERSION = "v1"
+
 
 @tool
 def fetch_rss_feed(feed_url: str) -> Dict[str, Any]:
@@ -14,16 +58,18 @@ def fetch_rss_feed(feed_url: str) -> Dict[str, Any]:
         feed_url: URL of the RSS feed
     
     Returns:
-        Dictionary with raw XML content and metadata
+        Dictionary with raw XML content, metadata, and not_modified flag
     """
-    print(f"  🔧 TOOL: fetch_rss_feed(feed_url='{feed_url}')")
-    time.sleep(0.3)
+    log.debug("fetch_rss_feed(feed_url=%s)", feed_url)
+    timeout = budget.current().call_timeout(30.0)
+    time.sleep(min(0.3, timeout))
     
     # Dummy response - in real implementation, would use fetch_with_crawl4ai
     return {
-        "xml_content": "<rss>...</rss>",  # Dummy XML
+        "xml_content": DUMMY_FEED_XML,
         "url": feed_url,
-        "domain": urlparse(feed_url).netloc
+        "domain": urlparse(feed_url).netloc,
+        "not_modified": False  # Real fetch would send If-None-Match / If-Modified-Since
     }
 
 
@@ -38,27 +84,12 @@ def parse_rss_feed(xml_content: str) -> List[Dict[str, Any]]:
     Returns:
         List of RSS entry dictionaries with title, description, link, etc.
     """
-    print(f"  🔧 TOOL: parse_rss_feed(xml_content='{len(xml_content)} chars')")
-    time.sleep(0.2)
-    
-    # Dummy response - in real implementation, would use feedparser.parse()
-    return [
-        {
-            "title": "Insurance Regulation Update 2024",
-            "description": "New regulations affecting insurance companies in 2024",
-            "link": "https://example.com/article1",
-            "published": "2024-01-15T10:00:00Z"
-        },
-        {
-            "title": "Climate Risk Assessment Guidelines",
-            "description": "New guidelines for assessing climate-related risks",
-            "link": "https://example.com/article2",
-            "published": "2024-01-14T15:30:00Z"
-        }
-    ]
+    log.debug("parse_rss_feed(xml_content=%d chars)", len(xml_content))
+    # XML parsing is CPU-bound - large feeds go to the process pool
+    return run_cpu_bound(parse_feed_xml, xml_content)
 
 
-@tool
+@pure_tool
 def is_valid_url(url: str) -> bool:
     """
     Validate if a URL is properly formatted.
@@ -69,8 +100,7 @@ def is_valid_url(url: str) -> bool:
     Returns:
         True if URL is valid, False otherwise
     """
-    print(f"  🔧 TOOL: is_valid_url(url='{url}')")
-    time.sleep(0.1)
+    log.debug("is_valid_url(url=%s)", url)
     
     try:
         result = urlparse(url)
@@ -79,6 +109,25 @@ def is_valid_url(url: str) -> bool:
         return False
 
 
+@tool
+def prefilter_concern(title: str, description: str) -> Dict[str, Any]:
+    """
+    Match RSS entry against the insurance concern taxonomy (no LLM call).
+    First tier of the concern cascade: clear negatives are dropped, clear
+    positives are fast-tracked, and only ambiguous entries go to the LLM.
+    
+    Args:
+        title: Article title
+        description: Article description
+    
+    Returns:
+        Dictionary with verdict ("negative" | "positive" | "ambiguous"),
+        score, matched terms, risks and naics_hints
+    """
+    log.debug("prefilter_concern(title=%.50s)", title)
+    return get_concern_matcher().classify(title + "\n" + description)
+
+
 @tool
 def check_concern_with_llm(title: str, description: str) -> bool:
     """
@@ -92,17 +141,29 @@ def check_concern_with_llm(title: str, description: str) -> bool:
     Returns:
         True if article has concerns, False otherwise
     """
-    print(f"  🔧 TOOL: check_concern_with_llm(title='{title[:50]}...')")
-    time.sleep(0.5)
+    log.debug("check_concern_with_llm(title=%.50s)", title)
+    return get_concern_cache().get_or_compute(
+        title,
+        description,
+        CONCERN_PROMPT_VERSION,
+        lambda: _llm_concern_check(title, description),
+        # Another run's deadline or budget running out says nothing about ours
+        retry_on=(budget.BudgetExceeded, TimeoutError),
+    )
+
+
+def _llm_concern_check(title: str, description: str) -> bool:
+    """Make the actual LLM concern check (cache miss path)."""
+    # Shared client applies rate limits and adaptive concurrency
+    get_llm_client().invoke(f"CONCERN_CHECK_FOR_RSS_PROMPT\n{title}\n{description}", max_tokens=16)
     
-    # Dummy response - in real implementation, would use BedrockClient
-    # with CONCERN_CHECK_FOR_RSS_PROMPT
+    # Dummy response - in real implementation, would parse the model output
     keywords = ["insurance", "risk", "regulation", "climate", "legal"]
     text = (title + " " + description).lower()
     return any(keyword in text for keyword in keywords)
 
 
-@tool
+@pure_tool
 def extract_domain(url: str) -> str:
     """
     Extract domain from URL for domain-based queuing.
@@ -113,8 +174,7 @@ def extract_domain(url: str) -> str:
     Returns:
         Domain string (e.g., "example.com")
     """
-    print(f"  🔧 TOOL: extract_domain(url='{url}')")
-    time.sleep(0.1)
+    log.debug("extract_domain(url=%s)", url)
     
     try:
         return urlparse(url).netloc
@@ -1,5 +1,19 @@
 """Scheduler Agent - Routes to appropriate source agent based on trigger_type"""
 from .agent import scheduler_node
+from .jobs import SourceJob, JobQueue, load_source_jobs
+from .service import SchedulerService
+from .polling import AdaptivePollingPolicy, get_polling_policy
+from .sharding import shard_for, select_shard_jobs, get_shard_from_env
 
-__all__ = ["scheduler_node"]
-
+__all__ = [
+    "scheduler_node",
+    "SourceJob",
+    "JobQueue",
+    "load_source_jobs",
+    "SchedulerService",
+    "AdaptivePollingPolicy",
+    "get_polling_policy",
+    "shard_for",
+    "select_shard_jobs",
+    "get_shard_from_env",
+]
@@ -5,13 +5,22 @@ from pathlib import Path
 # Handle imports
 try:
     from ...state import AgentState
+    from ... import budget
+    from ...logs import get_logger, logged_node
 except ImportError:
     parent_dir = str(Path(__file__).parent.parent.parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
+    import budget
+    from logs import get_logger, logged_node
 
 
+log = get_logger("scheduler")
+
+
+@logged_node("scheduler")
+@budget.budgeted
 def scheduler_node(state: AgentState) -> AgentState:
     """
     Scheduler Agent Node - Routes to appropriate source agent.
@@ -25,21 +34,17 @@ def scheduler_node(state: AgentState) -> AgentState:
     The scheduler doesn't do any processing itself - it just sets up
     the state for the next agent and lets LangGraph route to it.
     """
-    print(f"\n{'='*60}")
-    print(f"📅 SCHEDULER AGENT")
-    print(f"{'='*60}")
-    
     trigger_type = state.get("trigger_type", "").lower()
     
-    print(f"📋 Trigger Type: {trigger_type}")
-    print(f"📋 Current State:")
-    print(f"   - Source: {state.get('source', 'not set')}")
-    print(f"   - URL: {state.get('url', 'not set')}")
-    print()
+    run_budget = budget.current()
+    log.debug("Trigger type %s", trigger_type, extra={
+        "seconds_left": run_budget.remaining_seconds(),
+        "llm_usd_left": run_budget.remaining_usd(),
+    })
     
     # Set up state based on trigger type
     if trigger_type == "rss":
-        print("✅ Routing to RSS Agent")
+        log.debug("Routing to RSS Agent")
         # Set feed info if not already set
         if not state.get("feed_url"):
             state["feed_url"] = "https://example.com/feed.rss"
@@ -49,26 +54,24 @@ def scheduler_node(state: AgentState) -> AgentState:
         state["workflow_step"] = "rss_agent"
         
     elif trigger_type == "api":
-        print("✅ Routing to API Agent (CourtListener)")
+        log.debug("Routing to API Agent (CourtListener)")
         state["current_agent"] = "scheduler"
         state["workflow_step"] = "api_agent"
         
     elif trigger_type == "proquest":
-        print("⚠️ ProQuest Agent not yet implemented")
+        log.warning("ProQuest Agent not yet implemented")
         state["should_continue"] = False
         state["errors"].append("ProQuest Agent not implemented")
         
     elif trigger_type == "websearch":
-        print("⚠️ WebSearch Agent not yet implemented")
+        log.warning("WebSearch Agent not yet implemented")
         state["should_continue"] = False
         state["errors"].append("WebSearch Agent not implemented")
         
     else:
-        print(f"❌ Unknown trigger_type: {trigger_type}")
-        print("   Valid types: 'rss', 'api', 'proquest', 'websearch'")
+        log.error("Unknown trigger_type %r (valid: 'rss', 'api', 'proquest', 'websearch')", trigger_type)
         state["should_continue"] = False
         state["errors"].append(f"Unknown trigger_type: {trigger_type}")
     
-    print()
     return state
 
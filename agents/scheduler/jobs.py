@@ -0,0 +1,109 @@
+"""Scheduler Jobs - source jobs and the due-time priority queue"""
+import heapq
+import itertools
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set
+
+
+@dataclass
+class SourceJob:
+    """One pollable source (RSS feed, CourtListener court, ...)."""
+    job_id: str  # Stable id, e.g. "rss:https://example.com/feed.rss"
+    trigger_type: str  # "rss" | "api" | "proquest" | "websearch"
+    params: Dict[str, Any]  # Merged into the initial state (feed_url, court_id, ...)
+    interval_seconds: float = 3600.0
+    priority: int = 5  # Lower runs first when due at the same time
+    group: str = ""  # Fairness group; defaults to trigger_type
+    due_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        if not self.group:
+            self.group = self.trigger_type
+
+
+class JobQueue:
+    """
+    Priority queue of source jobs ordered by (due_at, priority).
+
+    `pop_ready` skips jobs whose fairness group is saturated, so a backlog
+    in one group never blocks due jobs of another.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, job: SourceJob) -> None:
+        heapq.heappush(self._heap, (job.due_at, job.priority, next(self._seq), job))
+
+    def next_due_at(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_ready(self, now: float, blocked_groups: Set[str]) -> Optional[SourceJob]:
+        """Pop the most urgent due job outside blocked_groups, or None."""
+        skipped = []
+        job = None
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[3].group in blocked_groups:
+                skipped.append(entry)
+                continue
+            job = entry[3]
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return job
+
+
+DEFAULT_SOURCES = {
+    "feeds": [
+        {"url": "https://example.com/feed.rss", "name": "default-feed", "interval_minutes": 60}
+    ],
+    "courts": [
+        {"id": "scotus", "interval_minutes": 360}
+    ]
+}
+
+
+def load_source_jobs(path: Optional[str] = None) -> List[SourceJob]:
+    """
+    Build source jobs from a JSON config.
+
+    Config shape:
+        {"feeds": [{"url", "name", "interval_minutes", "priority"}],
+         "courts": [{"id", "interval_minutes", "priority"}]}
+
+    Args:
+        path: Config file; defaults to SCHEDULER_SOURCES_PATH, then DEFAULT_SOURCES
+    """
+    path = path or os.getenv("SCHEDULER_SOURCES_PATH")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            sources = json.load(f)
+    else:
+        sources = DEFAULT_SOURCES
+
+    jobs = []
+    for feed in sources.get("feeds", []):
+        jobs.append(SourceJob(
+            job_id=f"rss:{feed['url']}",
+            trigger_type="rss",
+            params={"feed_url": feed["url"], "feed_name": feed.get("name", feed["url"])},
+            interval_seconds=feed.get("interval_minutes", 60) * 60,
+            priority=feed.get("priority", 5),
+        ))
+    for court in sources.get("courts", []):
+        jobs.append(SourceJob(
+            job_id=f"api:{court['id']}",
+            trigger_type="api",
+            params={"court_id": court["id"]},
+            interval_seconds=court.get("interval_minutes", 360) * 60,
+            priority=court.get("priority", 5),
+        ))
+    return jobs
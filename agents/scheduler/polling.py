@@ -0,0 +1,146 @@
+"""Adaptive Polling - per-feed poll intervals learned from publish history"""
+import json
+import os
+import statistics
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .jobs import SourceJob
+
+
+DEFAULT_STATS_PATH = ".cache/feed_stats.json"
+MAX_SEEN_LINKS = 500
+MAX_PUBLISHED = 50
+MAX_POLLS = 20
+BACKOFF_FACTOR = 1.5
+
+
+def parse_published(value: Optional[str]) -> Optional[float]:
+    """Parse an RSS/Atom published timestamp (RFC 822 or ISO 8601) to epoch seconds."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class AdaptivePollingPolicy:
+    """
+    Learns a poll interval per feed from what each poll returned.
+
+    Per feed it keeps recent entry `published` timestamps, new-item counts
+    per poll and not-modified outcomes. The next interval blends:
+    - the median gap between publications (how often the feed publishes)
+    - the last interval, stretched after empty/not-modified polls and
+      shrunk when a poll returned several new items
+    and is clamped to [min_seconds, max_seconds]. Non-RSS jobs keep their
+    configured interval.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_STATS_PATH,
+        min_seconds: float = 5 * 60,
+        max_seconds: float = 24 * 3600,
+    ):
+        self.path = path
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._stats = json.load(f)
+
+    def _save(self) -> None:
+        # Caller holds self._lock; write-then-rename so a crash never truncates the file
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._stats, f)
+        os.replace(tmp_path, self.path)
+
+    def restore(self, job: SourceJob) -> None:
+        """Apply the learned interval and next due time to a freshly loaded job."""
+        stats = self._stats.get(job.job_id)
+        if stats:
+            job.interval_seconds = stats.get("interval_seconds", job.interval_seconds)
+            job.due_at = stats.get("next_due_at", job.due_at)
+
+    def _compute_interval(self, stats: Dict[str, Any], current: float) -> float:
+        polls = stats["polls"]
+        last = polls[-1]
+        if last["not_modified"] or last["new_items"] == 0:
+            outcome_interval = current * BACKOFF_FACTOR
+        elif last["new_items"] > 1:
+            outcome_interval = current / last["new_items"]
+        else:
+            outcome_interval = current
+
+        published = sorted(stats["published"])
+        gaps = [b - a for a, b in zip(published, published[1:]) if b > a]
+        if gaps:
+            # Geometric mean: publish rate anchors, poll outcomes steer
+            interval = (statistics.median(gaps) * outcome_interval) ** 0.5
+        else:
+            interval = outcome_interval
+        return min(self.max_seconds, max(self.min_seconds, interval))
+
+    def __call__(self, job: SourceJob, result: Optional[Dict[str, Any]]) -> float:
+        """
+        Record a finished poll and return the job's next interval.
+
+        Args:
+            job: The job that just ran
+            result: Final graph state, or None if the run failed
+        """
+        feed_poll = (result or {}).get("feed_poll")
+        if job.trigger_type != "rss" or feed_poll is None:
+            return job.interval_seconds
+
+        with self._lock:
+            stats = self._stats.setdefault(job.job_id, {"seen": [], "published": [], "polls": []})
+            seen = set(stats["seen"])
+            new_items = 0
+            for entry in feed_poll.get("entries", []):
+                link = entry.get("link")
+                if not link or link in seen:
+                    continue
+                new_items += 1
+                seen.add(link)
+                stats["seen"].append(link)
+                published = parse_published(entry.get("published"))
+                if published is not None:
+                    stats["published"].append(published)
+            stats["seen"] = stats["seen"][-MAX_SEEN_LINKS:]
+            stats["published"] = sorted(stats["published"])[-MAX_PUBLISHED:]
+            stats["polls"].append({
+                "at": time.time(),
+                "new_items": new_items,
+                "not_modified": bool(feed_poll.get("not_modified")),
+            })
+            stats["polls"] = stats["polls"][-MAX_POLLS:]
+
+            interval = self._compute_interval(stats, job.interval_seconds)
+            stats["interval_seconds"] = interval
+            stats["next_due_at"] = time.time() + interval
+            self._save()
+        return interval
+
+
+def get_polling_policy() -> AdaptivePollingPolicy:
+    """Build the polling policy from environment settings."""
+    return AdaptivePollingPolicy(
+        path=os.getenv("FEED_STATS_PATH", DEFAULT_STATS_PATH),
+        min_seconds=float(os.getenv("POLL_MIN_MINUTES", "5")) * 60,
+        max_seconds=float(os.getenv("POLL_MAX_MINUTES", "1440")) * 60,
+    )
@@ -0,0 +1,129 @@
+"""Scheduler Service - long-lived dispatcher with a bounded async worker pool"""
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .jobs import SourceJob, JobQueue
+
+try:
+    from ...logs import bind, get_logger
+except ImportError:
+    from logs import bind, get_logger
+
+
+log = get_logger("scheduler.service")
+
+
+JobRunner = Callable[[SourceJob], Awaitable[object]]
+IntervalPolicy = Callable[[SourceJob, Optional[object]], float]
+
+
+class SchedulerService:
+    """
+    Dispatches due source jobs to a bounded pool of async workers.
+
+    - Jobs come off a JobQueue ordered by due time, then priority
+    - At most `workers` graph invocations run at once
+    - While another group has due jobs waiting, a fairness group (default:
+      trigger_type) may use at most `max_per_group` workers, so one slow
+      source type cannot starve others; with nothing else waiting it may
+      borrow the idle slots, so the pool is never left idle
+    - A job is never run twice concurrently; it is re-queued
+      `interval_seconds` after its run finishes
+    - An optional `interval_policy(job, result)` picks that interval from
+      the run's final state (e.g. AdaptivePollingPolicy)
+    """
+
+    def __init__(
+        self,
+        jobs: List[SourceJob],
+        run_job: JobRunner,
+        workers: int = 4,
+        max_per_group: Optional[int] = None,
+        job_timeout: float = 900.0,
+        interval_policy: Optional[IntervalPolicy] = None,
+    ):
+        self.run_job = run_job
+        self.interval_policy = interval_policy
+        self.workers = workers
+        self.max_per_group = max_per_group or max(1, math.ceil(workers / 2))
+        self.job_timeout = job_timeout
+        self.queue = JobQueue()
+        for job in jobs:
+            self.queue.push(job)
+        self._group_running: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self.completed = 0
+        self.failed = 0
+
+    def _blocked_groups(self):
+        return {g for g, n in self._group_running.items() if n >= self.max_per_group}
+
+    def _reschedule(self, job: SourceJob, result: Optional[object]) -> None:
+        if self.interval_policy is not None:
+            try:
+                job.interval_seconds = self.interval_policy(job, result)
+            except Exception as e:
+                log.warning("Interval policy failed for %s: %s", job.job_id, e)
+        job.due_at = time.time() + job.interval_seconds
+        self.queue.push(job)
+
+    async def _next_job(self, stop: asyncio.Event) -> Optional[SourceJob]:
+        while not stop.is_set():
+            now = time.time()
+            blocked = self._blocked_groups()
+            job = self.queue.pop_ready(now, blocked)
+            if job is None and blocked:
+                # No other group has a due job waiting: borrow the idle slot
+                job = self.queue.pop_ready(now, set())
+            if job is not None:
+                return job
+            next_due = self.queue.next_due_at()
+            if next_due is None:
+                timeout = 1.0
+            elif next_due <= now:
+                # Due work exists but can't be taken yet; a finishing run sets _wakeup
+                timeout = None
+            else:
+                timeout = min(next_due - now, 60.0)
+            self._wakeup.clear()
+            waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wakeup.wait())]
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+        return None
+
+    async def _worker(self, stop: asyncio.Event) -> None:
+        while True:
+            job = await self._next_job(stop)
+            if job is None:
+                return
+            self._group_running[job.group] = self._group_running.get(job.group, 0) + 1
+            log.info("Dispatching %s (priority %s)", job.job_id, job.priority)
+            result = None
+            try:
+                with bind(job_id=job.job_id):
+                    result = await asyncio.wait_for(self.run_job(job), timeout=self.job_timeout)
+                self.completed += 1
+            except asyncio.TimeoutError:
+                self.failed += 1
+                log.error("%s timed out after %ss", job.job_id, self.job_timeout)
+            except Exception as e:
+                self.failed += 1
+                log.error("%s failed: %s", job.job_id, e)
+            finally:
+                self._group_running[job.group] -= 1
+                self._reschedule(job, result)
+                # A freed group slot may unblock jobs that were skipped
+                self._wakeup.set()
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Run until `stop` is set, then let in-flight jobs finish.
+
+        Args:
+            stop: Event that ends dispatching; runs forever if omitted
+        """
+        stop = stop or asyncio.Event()
+        await asyncio.gather(*(self._worker(stop) for _ in range(self.workers)))
@@ -0,0 +1,57 @@
+"""Sharding - split source jobs across AWS Batch array children by consistent hashing"""
+import hashlib
+import os
+from typing import List, Optional, Tuple
+
+from .jobs import SourceJob
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach).
+
+    Growing from n to n+1 buckets moves only ~1/(n+1) of the keys, and all
+    of them to the new bucket, so existing shards keep their sources (and
+    their warm local caches).
+    """
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def shard_for(job_id: str, shard_count: int) -> int:
+    """Shard index owning a source (job_id is e.g. "rss:<feed url>" or "api:<court id>")."""
+    return jump_hash(_key_hash(job_id), shard_count)
+
+
+def select_shard_jobs(jobs: List[SourceJob], shard_index: int, shard_count: int) -> List[SourceJob]:
+    """Jobs owned by this shard."""
+    return [job for job in jobs if shard_for(job.job_id, shard_count) == shard_index]
+
+
+def get_shard_from_env() -> Optional[Tuple[int, int]]:
+    """
+    Read (shard_index, shard_count) for an array job.
+
+    The index comes from AWS_BATCH_JOB_ARRAY_INDEX (set by AWS Batch on each
+    child); the count from SHARD_COUNT, falling back to AWS_BATCH_JOB_ARRAY_SIZE
+    (set it in the job definition - Batch does not export the array size).
+    Returns None outside an array job.
+    """
+    index = os.getenv("AWS_BATCH_JOB_ARRAY_INDEX")
+    if index is None:
+        return None
+    count = os.getenv("SHARD_COUNT") or os.getenv("AWS_BATCH_JOB_ARRAY_SIZE")
+    if not count:
+        raise ValueError("AWS_BATCH_JOB_ARRAY_INDEX is set but SHARD_COUNT / AWS_BATCH_JOB_ARRAY_SIZE is not")
+    shard_index, shard_count = int(index), int(count)
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index {shard_index} out of range for {shard_count} shards")
+    return shard_index, shard_count
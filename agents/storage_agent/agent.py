@@ -6,29 +6,38 @@ from datetime import datetime
 # Handle imports
 try:
     from ...state import AgentState
+    from ... import budget
+    from ...logs import get_logger, logged_node
     from .tools import save_to_s3
+    from ..classification_agent.near_duplicate import get_near_duplicate_index
 except ImportError:
     parent_dir = str(Path(__file__).parent.parent.parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
+    import budget
+    from logs import get_logger, logged_node
     from agents.storage_agent.tools import save_to_s3
+    from agents.classification_agent.near_duplicate import get_near_duplicate_index
 
 
+log = get_logger("storage_agent")
+
+
+@logged_node("storage")
+@budget.budgeted
 def storage_agent_node(state: AgentState) -> AgentState:
     """
     Storage Agent Node - Uses tools to save to S3.
     This agent receives state from Classification Agent and completes the workflow.
     """
-    print(f"\n{'='*60}")
-    print(f"🤖 STORAGE AGENT")
-    print(f"{'='*60}")
-    print("Agent activated. My tools:")
-    print(f"  - {save_to_s3.name}")
-    print()
-    print(f"📥 Received state from: {state.get('current_agent', 'unknown')}")
-    print(f"📊 Classification data: {state.get('classification', {})}")
-    print()
+    log.debug("Received state from %s", state.get("current_agent", "unknown"))
+    
+    # Source agent stopped early (no concerns, not modified, shed)
+    if not state.get("should_continue", True):
+        log.debug("Nothing to store, ending workflow")
+        state["current_agent"] = "storage"
+        return state
     
     # Build S3 key
     source = state.get("source", "unknown")
@@ -42,16 +51,29 @@ def storage_agent_node(state: AgentState) -> AgentState:
     payload = {
         "url": state.get("url"),
         "title": state.get("title"),
-        "content": state.get("content", "")[:500],
+        "content": (state.get("content") or "")[:500],
         "classification": state.get("classification", {}),
-        "metadata": state.get("metadata", {})
+        "metadata": state.get("metadata", {}),
+        "duplicate_of": state.get("duplicate_of"),
+        # Classification was shed near the deadline/budget; reprocess later
+        "partial": state.get("classification") is None
     }
     
     # Use tool to save
-    print("📋 Saving to S3...")
     saved = save_to_s3.invoke({"bucket": s3_bucket, "key": s3_key, "data": payload})
-    print(f"   ✅ Saved: s3://{s3_bucket}/{s3_key}")
-    print()
+    log.info("Saved s3://%s/%s", s3_bucket, s3_key, extra={"partial": payload["partial"]})
+    
+    # Register original records so later syndicated copies can link to them
+    fingerprint = state.get("content_fingerprint")
+    if saved and fingerprint and state.get("classification") and not state.get("duplicate_of"):
+        get_near_duplicate_index().add(int(fingerprint, 16), {
+            "url": state.get("url"),
+            "title": state.get("title"),
+            "source": source,
+            "s3_key": s3_key,
+            "classification": state.get("classification"),
+        })
+        log.debug("Indexed fingerprint %s for near-duplicate detection", fingerprint)
     
     # Update state (workflow complete)
     state["s3_key"] = s3_key
@@ -60,6 +82,5 @@ def storage_agent_node(state: AgentState) -> AgentState:
     state["current_agent"] = "storage"
     state["should_continue"] = False  # End workflow
     
-    print("📤 My work is done. Workflow complete!")
     return state
 
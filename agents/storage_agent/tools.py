@@ -3,6 +3,16 @@ from langchain_core.tools import tool
 from typing import Dict, Any
 import time
 
+try:
+    from ... import budget
+    from ...logs import get_logger
+except ImportError:
+    import budget
+    from logs import get_logger
+
+
+log = get_logger("storage_agent.tools")
+
 
 @tool
 def save_to_s3(bucket: str, key: str, data: Dict[str, Any]) -> bool:
@@ -17,9 +27,10 @@ def save_to_s3(bucket: str, key: str, data: Dict[str, Any]) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    print(f"  🔧 TOOL: save_to_s3(bucket='{bucket}', key='{key}')")
-    print(f"      💾 [DUMMY S3 WRITE] Saving to S3...")
-    time.sleep(0.3)
+    log.debug("save_to_s3(bucket=%s, key=%s)", bucket, key)
+    # Storage is critical: it gets whatever time is left, even inside the reserve
+    timeout = budget.current().call_timeout(30.0, budget.CRITICAL)
+    time.sleep(min(0.3, timeout))
     
     # Dummy save
     return True
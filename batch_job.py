@@ -5,10 +5,26 @@ This script is the entry point for AWS Batch jobs.
 It accepts command-line arguments to specify which agent to run.
 """
 import asyncio
+import contextlib
+import os
+import signal
 import sys
+import uuid
 import argparse
-from workflow import build_workflow
+from typing import Optional
+from workflow import get_workflow, preload_agents
 from state import AgentState
+from budget import initial_budget_fields, start_job
+from logs import bind, configure_logging, set_fields
+from streaming import JsonLinesSink, stream_run
+from agents.scheduler import (
+    SchedulerService,
+    SourceJob,
+    load_source_jobs,
+    get_polling_policy,
+    get_shard_from_env,
+    select_shard_jobs,
+)
 
 
 def create_initial_state(trigger_type: str = "rss") -> AgentState:
@@ -29,6 +45,8 @@ def create_initial_state(trigger_type: str = "rss") -> AgentState:
         "metadata": {},
         "pre_scraped_content": None,
         "classification": None,
+        "content_fingerprint": None,
+        "duplicate_of": None,
         "s3_key": None,
         "s3_bucket": None,
         "saved": False,
@@ -37,29 +55,35 @@ def create_initial_state(trigger_type: str = "rss") -> AgentState:
         "errors": [],
         "should_continue": True,
         "domain_queue_id": None,
-        "duplicate_check_enabled": False,
-        "skip_duplicate_check": True
+        "duplicate_check_enabled": True,
+        "skip_duplicate_check": False
     }
     
+    # Deadline and LLM budget (JOB_DEADLINE_SECONDS / LLM_BUDGET_USD)
+    state.update(initial_budget_fields())
+    
     # Add RSS-specific fields if RSS flow
     if trigger_type == "rss":
-        import os
         state["feed_url"] = os.getenv("RSS_FEED_URL", "https://example.com/feed.rss")
         state["feed_name"] = os.getenv("RSS_FEED_NAME", "default-feed")
     
+    # Add API-specific fields if API flow
+    if trigger_type == "api":
+        state["court_id"] = os.getenv("COURTLISTENER_COURT_ID", "scotus")
+    
     return state
 
 
-async def run_workflow(trigger_type: str):
-    """Run workflow with specified trigger type"""
+async def run_workflow(trigger_type: str, sink: Optional[JsonLinesSink] = None):
+    """Run workflow with specified trigger type, streaming events to sink if given"""
     print(f"\n{'='*70}")
     print(f"🚀 AWS BATCH JOB - LangGraph Workflow")
     print(f"   Agent: {trigger_type}")
     print(f"{'='*70}\n")
     
     try:
-        # Build workflow
-        app = build_workflow()
+        # Build workflow (compiled once per process)
+        app = get_workflow()
         print(f"✅ Workflow built successfully")
         print(f"   Nodes: {list(app.nodes.keys())}\n")
         
@@ -70,8 +94,13 @@ async def run_workflow(trigger_type: str):
         print("🚀 Starting workflow execution...")
         print("="*70)
         
-        config = {"configurable": {"thread_id": f"batch-{trigger_type}-{asyncio.get_event_loop().time()}"}}
-        final_state = await app.ainvoke(initial_state, config)
+        thread_id = f"batch-{trigger_type}-{asyncio.get_event_loop().time()}"
+        config = {"configurable": {"thread_id": thread_id}}
+        with bind(thread_id=thread_id):
+            if sink:
+                final_state = await stream_run(app, initial_state, config, sink)
+            else:
+                final_state = await app.ainvoke(initial_state, config)
         
         print("\n" + "="*70)
         print("📊 FINAL STATE SUMMARY")
@@ -99,8 +128,190 @@ async def run_workflow(trigger_type: str):
         return 1  # Failure
 
 
+def make_job_runner(app, sink: Optional[JsonLinesSink] = None):
+    """Build the coroutine that runs one source job through the graph"""
+    async def run_job(job: SourceJob):
+        state = create_initial_state(job.trigger_type)
+        state.update(job.params)
+        thread_id = f"{job.job_id}-{asyncio.get_running_loop().time()}"
+        config = {"configurable": {"thread_id": thread_id}}
+        with bind(thread_id=thread_id):
+            try:
+                if sink:
+                    return await stream_run(app, state, config, sink)
+                return await app.ainvoke(state, config)
+            finally:
+                # Long-lived processes run many threads; don't keep every run's checkpoints
+                delete_thread = getattr(app.checkpointer, "adelete_thread", None)
+                if delete_thread:
+                    await delete_thread(thread_id)
+    return run_job
+
+
+def load_shard_jobs():
+    """Load source jobs, keeping only this shard's share when running as an array job"""
+    jobs = load_source_jobs()
+    shard = get_shard_from_env()
+    if shard is not None:
+        shard_index, shard_count = shard
+        total = len(jobs)
+        jobs = select_shard_jobs(jobs, shard_index, shard_count)
+        print(f"🧩 Shard {shard_index + 1}/{shard_count}: {len(jobs)} of {total} sources")
+    return jobs
+
+
+async def run_scheduler(workers: int, sink: Optional[JsonLinesSink] = None) -> int:
+    """Run the long-lived scheduler: poll every configured source on its schedule"""
+    print(f"\n{'='*70}")
+    print(f"📅 SCHEDULER SERVICE - LangGraph Workflow")
+    print(f"   Workers: {workers}")
+    print(f"{'='*70}\n")
+    
+    # One compiled graph shared by every job run
+    app = get_workflow()
+    jobs = load_shard_jobs()
+    polling = get_polling_policy()
+    for job in jobs:
+        polling.restore(job)
+    print(f"✅ Loaded {len(jobs)} source jobs")
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    
+    service = SchedulerService(jobs, make_job_runner(app, sink), workers=workers, interval_policy=polling)
+    await service.run(stop)
+    
+    print("\n" + "="*70)
+    print(f"✅ SCHEDULER STOPPED - {service.completed} runs completed, {service.failed} failed")
+    print("="*70)
+    return 0
+
+
+async def run_service(args, sink: Optional[JsonLinesSink] = None) -> int:
+    """Run the warm worker service: serve run requests until SIGTERM/SIGINT, then drain"""
+    # Imported here: only the service mode needs the intake servers and eager clients
+    from worker_service import WorkerService, build_intakes
+    from llm_client import get_llm_client
+    from http_client import get_http_client
+    from cpu_pool import get_process_pool
+    
+    intakes = build_intakes(args.queue_dir, args.socket, args.http_port, args.http_host)
+    if not intakes:
+        print("\n❌ ERROR: --serve needs at least one of --queue-dir, --socket or --http-port")
+        return 2
+    
+    print(f"\n{'='*70}")
+    print(f"🔥 WORKER SERVICE - LangGraph Workflow")
+    print(f"   Workers: {args.workers}")
+    print(f"   Intake: {', '.join(intake.endpoint for intake in intakes)}")
+    print(f"{'='*70}\n")
+    
+    # Pay every cold-start cost before the first request arrives
+    app = get_workflow()
+    preload_agents()
+    get_llm_client()
+    get_http_client()
+    # Start the CPU pool's forkserver now, not from a worker thread mid-run
+    get_process_pool()
+    print("✅ Graph, agents and clients warm")
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    
+    service = WorkerService(make_job_runner(app, sink), workers=args.workers)
+    await service.run(stop, intakes, drain_timeout=float(os.getenv("WORKER_DRAIN_SECONDS", "25")))
+    
+    print("\n" + "="*70)
+    print(f"✅ WORKER SERVICE STOPPED - {service.completed} runs completed, {service.failed} failed")
+    print("="*70)
+    return 0
+
+
+async def run_array_shard(workers: int, sink: Optional[JsonLinesSink] = None) -> int:
+    """Run each source owned by this array shard once, then exit"""
+    print(f"\n{'='*70}")
+    print(f"🧩 AWS BATCH ARRAY JOB - LangGraph Workflow")
+    print(f"   Workers: {workers}")
+    print(f"{'='*70}\n")
+    
+    try:
+        app = get_workflow()
+        jobs = load_shard_jobs()
+        run_job = make_job_runner(app, sink)
+        semaphore = asyncio.Semaphore(workers)
+        
+        async def run_one(job: SourceJob) -> bool:
+            async with semaphore:
+                try:
+                    await run_job(job)
+                    return True
+                except Exception as e:
+                    print(f"   ❌ {job.job_id} failed: {e}")
+                    return False
+        
+        results = await asyncio.gather(*(run_one(job) for job in jobs))
+        failed = results.count(False)
+        
+        print("\n" + "="*70)
+        print(f"{'✅' if not failed else '❌'} SHARD COMPLETE - {len(results) - failed} succeeded, {failed} failed")
+        print("="*70)
+        return 1 if failed else 0
+        
+    except Exception as e:
+        print(f"\n❌ ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+async def run_staged_pipeline(trigger_types, stage_workers) -> int:
+    """Run source, classification and storage as separate worker pools over durable queues"""
+    # Imported here: staged mode loads every agent up front, other modes don't need it
+    from staged import run_staged
+    
+    source_workers, classify_workers, storage_workers = stage_workers
+    print(f"\n{'='*70}")
+    print(f"🚀 AWS BATCH JOB - Staged Pipeline")
+    print(f"   Agents: {', '.join(trigger_types)}")
+    print(f"   Workers: source={source_workers} classification={classify_workers} storage={storage_workers}")
+    print(f"{'='*70}\n")
+    
+    try:
+        await run_staged(
+            [create_initial_state(t) for t in trigger_types],
+            source_workers=source_workers,
+            classify_workers=classify_workers,
+            storage_workers=storage_workers,
+        )
+        print("\n" + "="*70)
+        print("✅ STAGED PIPELINE COMPLETE!")
+        print("="*70)
+        return 0
+    except Exception as e:
+        print(f"\n❌ ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def parse_stage_workers(value: str):
+    """Parse "SOURCE,CLASSIFY,STORAGE" worker counts"""
+    counts = [int(v) for v in value.split(",")]
+    if len(counts) != 3 or min(counts) < 1:
+        raise argparse.ArgumentTypeError("expected three positive integers: SOURCE,CLASSIFY,STORAGE")
+    return counts
+
+
 async def main():
     """Main function for AWS Batch job"""
+    # JSON logs on stderr, WARNING and up unless LOG_LEVEL says otherwise
+    configure_logging()
+    set_fields(run_id=os.getenv("AWS_BATCH_JOB_ID") or uuid.uuid4().hex[:12])
+    
     parser = argparse.ArgumentParser(
         description="AWS Batch job for LangGraph multi-agent workflow",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -114,23 +325,131 @@ async def main():
         help="Which agent flow to run: 'rss', 'api', or 'all' (default: all)"
     )
     
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Run as a long-lived scheduler polling all sources from SCHEDULER_SOURCES_PATH"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent graph runs in --schedule / --array / --serve mode (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--array",
+        action="store_true",
+        help="Run this array shard's sources once; shard from AWS_BATCH_JOB_ARRAY_INDEX and SHARD_COUNT"
+    )
+    
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Run source, classification and storage as independent worker pools over durable local queues"
+    )
+    
+    parser.add_argument(
+        "--stage-workers",
+        type=parse_stage_workers,
+        default=[2, 4, 2],
+        help="Per-stage workers in --staged mode as SOURCE,CLASSIFY,STORAGE (default: 2,4,2)"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a warm worker service taking run requests from --queue-dir, --socket and/or --http-port"
+    )
+    
+    parser.add_argument(
+        "--queue-dir",
+        type=str,
+        default=None,
+        help="Directory of JSON run request files for --serve (default: WORKER_QUEUE_DIR)"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Unix socket path for --serve, one JSON request per line (default: WORKER_SOCKET)"
+    )
+    
+    parser.add_argument(
+        "--http-port",
+        type=int,
+        default=None,
+        help="Port for the --serve HTTP endpoint: POST /runs, GET /healthz (default: WORKER_HTTP_PORT)"
+    )
+    
+    parser.add_argument(
+        "--http-host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface for the --serve HTTP endpoint (default: 127.0.0.1)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Emit per-node progress and stored records as JSON lines while the run is going"
+    )
+    
+    parser.add_argument(
+        "--sink",
+        type=str,
+        default=None,
+        help="JSON lines file for --stream (default: stdout, with banners moved to stderr)"
+    )
+    
     args = parser.parse_args()
     
+    with contextlib.ExitStack() as stack:
+        sink = None
+        if args.stream:
+            sink = JsonLinesSink(args.sink)
+            stack.callback(sink.close)
+            if not args.sink:
+                # Keep stdout clean JSON lines for downstream consumers
+                stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        await dispatch(args, sink)
+
+
+async def dispatch(args, sink: Optional[JsonLinesSink]):
+    """Run the mode selected on the command line"""
+    if not args.serve:
+        # One deadline and LLM budget for every run in this job; --serve budgets each request
+        start_job()
     # Run workflow(s)
-    if args.agent == "all":
+    if args.schedule:
+        result = await run_scheduler(args.workers, sink)
+        sys.exit(result)
+    elif args.serve:
+        result = await run_service(args, sink)
+        sys.exit(result)
+    elif args.array:
+        result = await run_array_shard(args.workers, sink)
+        sys.exit(result)
+    elif args.staged:
+        trigger_types = ["rss", "api"] if args.agent == "all" else [args.agent]
+        result = await run_staged_pipeline(trigger_types, args.stage_workers)
+        sys.exit(result)
+    elif args.agent == "all":
         print("\n" + "="*70)
         print("🚀 RUNNING ALL AGENT FLOWS")
         print("="*70)
         
         # Run RSS flow
         print("\n" + "─"*70)
-        rss_result = await run_workflow("rss")
+        rss_result = await run_workflow("rss", sink)
         if rss_result != 0:
             sys.exit(rss_result)
         
         # Run API flow
         print("\n" + "─"*70)
-        api_result = await run_workflow("api")
+        api_result = await run_workflow("api", sink)
         if api_result != 0:
             sys.exit(api_result)
         
@@ -140,7 +459,7 @@ async def main():
         sys.exit(0)
     else:
         # Run single agent flow
-        result = await run_workflow(args.agent)
+        result = await run_workflow(args.agent, sink)
         sys.exit(result)
 
 
@@ -0,0 +1,93 @@
+"""
+Hedging Benchmark - batch tail latency with and without hedged requests
+
+Starts local HTTP servers with injected slowness: two typical hosts that
+answer in ~20ms but stall for 800ms on a small fraction of requests,
+and one consistently slower host. The same request mix is fetched through
+an HttpClient with hedging off and on.
+
+Usage:
+    python benchmarks/bench_hedging.py [--requests 300] [--tail 0.05]
+"""
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_client import HttpClient, urllib_backend
+
+
+def start_server(latency: float, tail_probability: float, tail_latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(tail_latency if random.random() < tail_probability else latency)
+            body = b"<html><body>ok</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(client: HttpClient, urls, concurrency: int):
+    def timed(url):
+        start = time.perf_counter()
+        client.get(url)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return sorted(pool.map(timed, urls))
+
+
+def pct(samples, q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure tail latency with and without hedging")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--tail", type=float, default=0.05, help="Probability a request stalls")
+    args = parser.parse_args()
+
+    servers = [
+        start_server(0.02, args.tail, 0.8),
+        start_server(0.02, args.tail, 0.8),
+        start_server(0.08, 0.0, 0.0),
+    ]
+    hosts = [f"http://127.0.0.1:{s.server_address[1]}" for s in servers]
+    urls = [f"{random.choice(hosts)}/doc/{i}" for i in range(args.requests)]
+    warmup = [f"{host}/warmup/{i}" for host in hosts for i in range(20)]
+
+    print(f"{'mode':<10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}{'hedges':>8}")
+    for mode, ratio in (("baseline", 0.0), ("hedged", 0.1)):
+        client = HttpClient(urllib_backend, hedge_ratio=ratio, min_hedge_delay=0.01)
+        run(client, warmup, args.concurrency)
+        client.requests = client.hedges = 0
+        samples = run(client, urls, args.concurrency)
+        print(f"{mode:<10}{pct(samples, 0.5):>10.1f}{pct(samples, 0.95):>10.1f}{pct(samples, 0.99):>10.1f}"
+              f"{samples[-1] * 1000:>10.1f}{client.hedges:>8}")
+        print(f"{'':<10}mean {statistics.mean(samples) * 1000:.1f} ms over {len(samples)} requests")
+
+    for server in servers:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+AIMD Benchmark - adaptive LLM concurrency against a throttling model server
+
+Drives concurrent calls through the shared LLM client backed by a
+FakeModelServer, sampling the AIMD concurrency limit as it runs. Two
+scenarios, each isolating one back-off signal:
+- latency: the server never throttles, but latency climbs with load, so
+  the limit must back off on latency growth
+- throttle: flat latency and a hard concurrency cap, so the limit must
+  back off on ThrottlingError
+
+In both the limit should rise from its initial value, then halve when the
+signal fires and settle below the server's capacity. Exits non-zero if a
+scenario's limit never rises or its back-off never fires.
+
+Usage:
+    python benchmarks/bench_llm_aimd.py [--seconds 3] [--callers 24]
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llm_client import AIMDController, FakeModelServer, LLMClient, ThrottlingError, get_llm_client, set_llm_client
+
+
+def scenarios(callers: int):
+    return {
+        # Capacity for every caller, so nothing is throttled: only latency growth can stop the climb
+        "latency": dict(max_concurrency=callers, requests_per_second=10_000, congestion=3.0),
+        # No congestion: only the concurrency cap can stop the climb
+        "throttle": dict(max_concurrency=max(2, callers // 3), requests_per_second=10_000, congestion=0.0),
+    }
+
+
+def run(server_args: dict, seconds: float, callers: int, base_latency: float):
+    server = FakeModelServer(base_latency=base_latency, **server_args)
+    controller = AIMDController(initial=2, maximum=32)
+    # Client-side buckets out of the way: the controller alone sets concurrency
+    set_llm_client(LLMClient(server, requests_per_second=10_000, tokens_per_minute=1e9,
+                             controller=controller, max_retries=8))
+    stop = threading.Event()
+    calls = [0]
+    lock = threading.Lock()
+
+    def caller():
+        while not stop.is_set():
+            try:
+                get_llm_client().invoke("Does this article raise an insurance concern?", max_tokens=16)
+            except ThrottlingError:
+                continue
+            with lock:
+                calls[0] += 1
+
+    threads = [threading.Thread(target=caller, daemon=True) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    samples = []
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        samples.append(controller.limit)
+        time.sleep(0.05)
+    stop.set()
+    for t in threads:
+        t.join()
+    set_llm_client(None)
+    return samples, controller, server, calls[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show the AIMD limit rising and backing off")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--callers", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.02, help="Server base latency (s)")
+    args = parser.parse_args()
+
+    failed = False
+    for scenario, server_args in scenarios(args.callers).items():
+        samples, controller, server, calls = run(server_args, args.seconds, args.callers, args.latency)
+        peak = max(samples)
+        backoffs = controller.latency_backoffs if scenario == "latency" else controller.throttle_backoffs
+        # Every 4th sample (~0.2s) keeps the trace on one line
+        print(f"{scenario:<9} limit: {' '.join(str(v) for v in samples[::4])}")
+        print(f"{'':<9} peak {peak}, final {samples[-1]}, {calls} calls, {server.throttled} throttled, "
+              f"backoffs: {controller.latency_backoffs} latency / {controller.throttle_backoffs} throttle")
+        if peak <= samples[0] or backoffs == 0:
+            print(f"{'':<9} FAIL: expected the limit to rise and {scenario} back-off to fire")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
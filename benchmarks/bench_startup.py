@@ -0,0 +1,76 @@
+"""
+Startup Benchmark - cold-start import and graph build time, with a budget
+
+Each sample runs in a fresh interpreter, the way a Batch container starts.
+Exits non-zero when the median cold start exceeds the budget. The default
+budget is about 30% over the measured cold start (~0.75s), so a regression
+such as an agent imported eagerly again fails it. The repo has no test
+runner, so run it by hand (or from CI) after changing imports.
+
+Usage:
+    python benchmarks/bench_startup.py [--samples 5] [--budget 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import batch_job
+t1 = time.perf_counter()
+from workflow import get_workflow
+get_workflow()
+t2 = time.perf_counter()
+get_workflow()
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "build": t2 - t1, "cached_build": t3 - t2, "total": t2 - t0}))
+"""
+
+
+def sample() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start time against a budget")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_SECONDS", "1.0")),
+        help="Max median cold start in seconds (default: STARTUP_BUDGET_SECONDS or 1.0)"
+    )
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.samples)]
+    report = {
+        key: round(statistics.median(s[key] for s in samples), 4)
+        for key in ("import", "build", "cached_build", "total")
+    }
+    report["budget"] = args.budget
+    print(json.dumps(report, indent=2))
+
+    if report["total"] > args.budget:
+        print(f"❌ Cold start {report['total']:.3f}s exceeds budget {args.budget:.3f}s")
+        return 1
+    print(f"✅ Cold start {report['total']:.3f}s within budget {args.budget:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
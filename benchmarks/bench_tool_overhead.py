@@ -0,0 +1,44 @@
+"""
+Tool Overhead Benchmark - per-call cost of .invoke vs the pure-tool fast path
+
+Usage:
+    python benchmarks/bench_tool_overhead.py [--calls 20000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tooling import run_tool
+from agents.rss_agent.tools import is_valid_url, extract_domain
+
+
+URL = "https://example.com/news/2024/01/15/insurance-regulation-update"
+
+
+def per_call_us(fn, calls: int) -> float:
+    # Tool bodies print a trace line; keep terminal I/O out of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return min(timeit.repeat(fn, number=calls, repeat=3)) / calls * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure per-call tool overhead")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'tool':<16}{'invoke (us)':>14}{'run_tool (us)':>16}{'raw func (us)':>16}")
+    for t in (is_valid_url, extract_domain):
+        invoke = per_call_us(lambda: t.invoke({"url": URL}), args.calls)
+        fast = per_call_us(lambda: run_tool(t, {"url": URL}), args.calls)
+        raw = per_call_us(lambda: t.func(URL), args.calls)
+        print(f"{t.name:<16}{invoke:>14.2f}{fast:>16.2f}{raw:>16.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Budget - wall-clock deadline and LLM spend ceiling carried through AgentState
+
+create_initial_state stamps `deadline_at` and `llm_budget_usd` on the
+state. Each agent node runs inside `activate(state)` (the `@budgeted`
+decorator), which makes the run's budget visible to every tool it calls
+(via a context variable) and writes the spend back to the state when the
+node finishes. Tools then:
+- shed work by priority (`should_shed`) as the deadline/budget nears
+- derive in-flight timeouts from what is left (`call_timeout`)
+- charge LLM spend (`charge`) and refuse calls past the ceiling
+
+Batch entry points call `start_job()` once, so every run of the job shares
+one deadline (counted from job start) and one spend ledger. Without it, as
+in the worker service, each run gets its own deadline and budget.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, Optional
+
+
+# Time kept in hand so a run near its limit can still flush storage
+RESERVE_SECONDS = float(os.getenv("DEADLINE_RESERVE_SECONDS", "60"))
+USD_PER_1K_TOKENS = float(os.getenv("LLM_USD_PER_1K_TOKENS", "0.003"))
+
+# Work priorities, shed in this order
+LOW = "low"  # Extra entries, long-document chunks
+NORMAL = "normal"  # LLM calls for the current item
+CRITICAL = "critical"  # Storage flush - never shed
+
+
+class BudgetExceeded(Exception):
+    """Raised when a call would run past the run's deadline or LLM budget."""
+
+
+class JobLedger:
+    """LLM spend of every run in one job, checked against the job's single ceiling."""
+
+    def __init__(self):
+        self.spent_usd = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, usd: float) -> None:
+        with self._lock:
+            self.spent_usd += usd
+
+
+class RunBudget:
+    """
+    Deadline and LLM spend for one workflow run.
+
+    With a ledger, the budget is the job's: remaining spend is what the
+    whole job has left, and the run's charges also go to the ledger.
+    """
+
+    def __init__(self, deadline_at: Optional[float] = None, budget_usd: Optional[float] = None, spent_usd: float = 0.0,
+                 ledger: Optional[JobLedger] = None):
+        self.deadline_at = deadline_at
+        self.budget_usd = budget_usd
+        self.spent_usd = spent_usd
+        self.ledger = ledger
+
+    def remaining_seconds(self) -> Optional[float]:
+        return None if self.deadline_at is None else self.deadline_at - time.time()
+
+    def _total_spent(self) -> float:
+        return self.ledger.spent_usd if self.ledger is not None else self.spent_usd
+
+    def remaining_usd(self) -> Optional[float]:
+        return None if self.budget_usd is None else self.budget_usd - self._total_spent()
+
+    def should_shed(self, priority: str = NORMAL) -> bool:
+        """
+        True when work of this priority should be skipped.
+
+        Low-priority work goes first, once under 2x the reserve time or
+        80% of the LLM budget is used; normal work once inside the reserve
+        or the budget is spent. Critical work is never shed.
+        """
+        if priority == CRITICAL:
+            return False
+        seconds = self.remaining_seconds()
+        usd = self.remaining_usd()
+        if priority == LOW:
+            return (seconds is not None and seconds < 2 * RESERVE_SECONDS) or (
+                usd is not None and usd < 0.2 * self.budget_usd
+            )
+        return (seconds is not None and seconds < RESERVE_SECONDS) or (usd is not None and usd <= 0)
+
+    def call_timeout(self, default: float, priority: str = NORMAL) -> float:
+        """
+        Timeout for an in-flight call: default, capped by the time left.
+
+        Non-critical calls may not eat into the reserve and raise
+        BudgetExceeded once it is reached; critical calls always get at
+        least one second so storage can still flush.
+        """
+        seconds = self.remaining_seconds()
+        if seconds is None:
+            return default
+        if priority == CRITICAL:
+            return min(default, max(seconds, 1.0))
+        seconds -= RESERVE_SECONDS
+        if seconds <= 0:
+            raise BudgetExceeded(f"Deadline reached ({priority} call)")
+        return min(default, seconds)
+
+    def charge(self, tokens: int) -> None:
+        usd = tokens / 1000.0 * USD_PER_1K_TOKENS
+        self.spent_usd += usd
+        if self.ledger is not None:
+            self.ledger.add(usd)
+
+    def check_llm(self, estimated_tokens: int) -> None:
+        """Raise BudgetExceeded if a call of this size would pass the ceiling."""
+        usd = self.remaining_usd()
+        if usd is not None and estimated_tokens / 1000.0 * USD_PER_1K_TOKENS > usd:
+            raise BudgetExceeded(f"LLM budget exhausted (${self._total_spent():.4f} of ${self.budget_usd:.4f} spent)")
+
+
+_job_deadline_at: Optional[float] = None
+_job_ledger: Optional[JobLedger] = None
+_job_lock = threading.Lock()
+
+
+def start_job() -> None:
+    """
+    Fix the deadline and LLM ceiling for the whole job; call once at startup.
+
+    Runs created afterwards share JOB_DEADLINE_SECONDS counted from now and
+    one spend ledger against LLM_BUDGET_USD, so a job running several flows
+    cannot overrun its hard time limit or spend the ceiling once per run.
+    Later calls are no-ops.
+    """
+    global _job_deadline_at, _job_ledger
+    with _job_lock:
+        if _job_ledger is not None:
+            return
+        deadline_seconds = os.getenv("JOB_DEADLINE_SECONDS")
+        _job_deadline_at = time.time() + float(deadline_seconds) if deadline_seconds else None
+        _job_ledger = JobLedger()
+
+
+_UNLIMITED = RunBudget()
+_current: contextvars.ContextVar[RunBudget] = contextvars.ContextVar("run_budget", default=_UNLIMITED)
+
+
+def current() -> RunBudget:
+    """Budget of the run executing in this context (unlimited outside a run)."""
+    return _current.get()
+
+
+@contextmanager
+def activate(state: Dict[str, Any]) -> Iterator[RunBudget]:
+    """Expose the state's budget to tools called inside the block; write spend back after."""
+    run_budget = RunBudget(
+        deadline_at=state.get("deadline_at"),
+        budget_usd=state.get("llm_budget_usd"),
+        spent_usd=state.get("llm_spent_usd") or 0.0,
+        ledger=_job_ledger,
+    )
+    token = _current.set(run_budget)
+    try:
+        yield run_budget
+    finally:
+        _current.reset(token)
+        state["llm_spent_usd"] = run_budget.spent_usd
+
+
+def budgeted(node: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Agent node decorator: run the node inside activate(state)."""
+    @functools.wraps(node)
+    def wrapper(state):
+        with activate(state):
+            return node(state)
+    return wrapper
+
+
+def initial_budget_fields() -> Dict[str, Any]:
+    """
+    Deadline/budget fields for create_initial_state, from JOB_DEADLINE_SECONDS and LLM_BUDGET_USD.
+
+    After start_job() the deadline is the job's; otherwise it counts from now (per run).
+    """
+    budget_usd = os.getenv("LLM_BUDGET_USD")
+    if _job_ledger is not None:
+        deadline_at = _job_deadline_at
+    else:
+        deadline_seconds = os.getenv("JOB_DEADLINE_SECONDS")
+        deadline_at = time.time() + float(deadline_seconds) if deadline_seconds else None
+    return {
+        "deadline_at": deadline_at,
+        "llm_budget_usd": float(budget_usd) if budget_usd else None,
+        "llm_spent_usd": 0.0,
+    }
@@ -0,0 +1,124 @@
+"""CPU Pool - offload CPU-bound tool bodies to a sized process pool
+
+Tool bodies run in the event loop's worker threads, so CPU-heavy parsing
+there holds the GIL and slows every fetch in the process. run_cpu_bound
+sends such work to worker processes instead. Large payloads travel through
+shared memory rather than being pickled down the pool's pipe; the worker
+still copies the segment once into bytes, since the extraction functions
+take str/bytes. Work that can read a file by path (large PDFs) goes through
+run_in_pool and is not copied at all.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Optional, TypeVar, Union
+
+
+T = TypeVar("T")
+
+# Below this size the pool round-trip costs more than the work itself
+DEFAULT_MIN_BYTES = 32 * 1024
+# Above this size the payload goes through shared memory
+DEFAULT_SHM_BYTES = 1024 * 1024
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # Respects container CPU limits
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _call_from_shared_memory(func: Callable[[bytes], T], name: str, size: int) -> T:
+    # Pool workers share the parent's resource tracker; the parent unlinks the segment.
+    # One copy out of the segment: func takes bytes, and must not outlive the mapping
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf[:size]
+        try:
+            return func(view.tobytes())
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process-wide pool, or None if offloading is disabled.
+
+    Sized by CPU_POOL_WORKERS (default: CPUs available to the container);
+    CPU_POOL_WORKERS=0 runs everything inline. Workers start from a
+    forkserver rather than fork: the pool is created lazily from an executor
+    thread while logging, HTTP and SQLite threads are live, and forking a
+    multi-threaded process can deadlock the child.
+    """
+    global _pool
+    workers = int(os.getenv("CPU_POOL_WORKERS", str(_available_cpus())))
+    if workers <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver"))
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def run_cpu_bound(func: Callable[[Union[str, bytes]], T], payload: Union[str, bytes]) -> T:
+    """
+    Run func(payload) in the process pool and wait for the result.
+
+    Small payloads run inline. func must be a module-level function that
+    accepts str or bytes (large payloads arrive as UTF-8 bytes).
+
+    Args:
+        func: Pure CPU-bound function, e.g. extraction.parse_feed_xml
+        payload: Text or bytes to process
+
+    Returns:
+        func's result
+    """
+    pool = get_process_pool()
+    min_bytes = int(os.getenv("CPU_POOL_MIN_BYTES", str(DEFAULT_MIN_BYTES)))
+    if pool is None or len(payload) < min_bytes:
+        return func(payload)
+
+    shm_bytes = int(os.getenv("CPU_POOL_SHM_BYTES", str(DEFAULT_SHM_BYTES)))
+    if len(payload) < shm_bytes:
+        return pool.submit(func, payload).result()
+
+    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+    shm = SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        return pool.submit(_call_from_shared_memory, func, shm.name, len(data)).result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def run_in_pool(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run func(*args) in the process pool (inline when offloading is disabled).
+
+    For CPU-bound work whose arguments are already small, e.g. a file path
+    and limits, so there is no payload to size or copy.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return func(*args)
+    return pool.submit(func, *args).result()
@@ -0,0 +1,211 @@
+"""Extraction - CPU-bound parsing and text extraction (process-pool safe)
+
+Every function here is a pure, module-level function taking str/bytes (or
+a file path), so cpu_pool can ship it to a worker process.
+"""
+import mmap
+import re
+import unicodedata
+import zlib
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from typing import Dict, Any, Iterator, List, Union
+
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+_WS_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def _text(element, tag: str) -> str:
+    child = element.find(tag)
+    return (child.text or "").strip() if child is not None else ""
+
+
+def parse_feed_xml(xml_content: Union[str, bytes]) -> List[Dict[str, Any]]:
+    """
+    Parse RSS 2.0 or Atom XML into entries.
+
+    Returns:
+        List of entry dictionaries with title, description, link, published
+    """
+    root = ET.fromstring(xml_content)
+    entries = []
+    for item in root.iter("item"):
+        entries.append({
+            "title": _text(item, "title"),
+            "description": _text(item, "description"),
+            "link": _text(item, "link"),
+            "published": _text(item, "pubDate") or None,
+        })
+    for item in root.iter(f"{ATOM_NS}entry"):
+        link = item.find(f"{ATOM_NS}link")
+        entries.append({
+            "title": _text(item, f"{ATOM_NS}title"),
+            "description": _text(item, f"{ATOM_NS}summary") or _text(item, f"{ATOM_NS}content"),
+            "link": link.get("href", "") if link is not None else "",
+            "published": _text(item, f"{ATOM_NS}published") or _text(item, f"{ATOM_NS}updated") or None,
+        })
+    return entries
+
+
+class _DocumentParser(HTMLParser):
+    """Collects title, meta description, links and body text, skipping boilerplate."""
+
+    SKIP_TAGS = {"script", "style", "nav", "header", "footer", "aside", "noscript", "form"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section", "article"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.description = ""
+        self.links: List[str] = []
+        self._parts: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta" and attrs.get("name", "").lower() == "description":
+            self.description = (attrs.get("content") or "").strip()
+        elif tag == "a" and attrs.get("href"):
+            self.links.append(attrs["href"])
+        if tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in self.BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._parts.append(data)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+def extract_html_document(html: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Strip boilerplate from an HTML page and extract its main text.
+
+    Returns:
+        Dictionary with title, description, content and pdf_links
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    parser = _DocumentParser()
+    parser.feed(html)
+    parser.close()
+    return {
+        "title": normalize_content(parser.title),
+        "description": parser.description,
+        "content": normalize_content(parser.text),
+        "pdf_links": [link for link in parser.links if link.lower().split("?")[0].endswith(".pdf")],
+    }
+
+
+def normalize_content(text: Union[str, bytes]) -> str:
+    """NFKC-normalize, collapse runs of whitespace and blank lines."""
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    text = unicodedata.normalize("NFKC", text)
+    text = _WS_RE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+# Stream dictionary of one indirect object (never crossing into the next object)
+_PDF_STREAM_RE = re.compile(rb"obj\s*<<((?:(?!endobj).)*?)>>\s*stream\r?\n", re.S)
+_PDF_ENDSTREAM_RE = re.compile(rb"endstream")
+_PDF_TEXT_BLOCK_RE = re.compile(rb"\bBT\b(.*?)\bET\b", re.S)
+_PDF_STRING_RE = re.compile(rb"\(((?:\\.|[^\\()])*)\)", re.S)
+_PDF_ESCAPE_RE = re.compile(rb"\\([nrtbf()\\]|[0-7]{1,3})")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+                b"(": b"(", b")": b")", b"\\": b"\\"}
+# Streams that never hold page text: fonts, images, object and xref streams
+_PDF_SKIP_RE = re.compile(rb"/Length1|/Subtype\s*/Image|/Type\s*/(?:XObject|ObjStm|XRef|Metadata)")
+
+
+def _pdf_unescape(literal: bytes) -> bytes:
+    def replace(match):
+        code = match.group(1)
+        return _PDF_ESCAPES.get(code) or bytes([int(code, 8) & 0xFF])
+    return _PDF_ESCAPE_RE.sub(replace, literal)
+
+
+def iter_pdf_pages(data, max_stream_bytes: int = 16 * 1024 * 1024) -> Iterator[str]:
+    """
+    Yield the text of each page content stream in a PDF, in file order.
+
+    data may be bytes or an mmap; only one (decompressed) stream is held in
+    memory at a time. Handles uncompressed and FlateDecode streams and
+    literal-string text operators; streams with other filters are skipped.
+
+    Args:
+        data: PDF file contents
+        max_stream_bytes: Decompressed size cap per stream
+    """
+    pos = 0
+    while True:
+        header = _PDF_STREAM_RE.search(data, pos)
+        if header is None:
+            return
+        end = _PDF_ENDSTREAM_RE.search(data, header.end())
+        if end is None:
+            return
+        pos = end.end()
+        stream_dict = header.group(1)
+        if _PDF_SKIP_RE.search(stream_dict):
+            continue
+        raw = data[header.end():end.start()]
+        if b"/Filter" in stream_dict:
+            if b"/FlateDecode" not in stream_dict:
+                continue
+            try:
+                raw = zlib.decompressobj().decompress(raw, max_stream_bytes)
+            except zlib.error:
+                continue
+        blocks = _PDF_TEXT_BLOCK_RE.findall(raw)
+        if not blocks:
+            continue
+        lines = [b" ".join(_pdf_unescape(s) for s in _PDF_STRING_RE.findall(block)) for block in blocks]
+        yield b"\n".join(lines).decode("latin-1")
+
+
+def extract_pdf_text(data, max_pages: int = 50, max_chars: int = 200_000) -> Dict[str, Any]:
+    """
+    Extract text from a PDF page by page, stopping at the page or character cap.
+
+    Returns:
+        Dictionary with text, pages (pages read) and truncated
+    """
+    pages: List[str] = []
+    chars = 0
+    truncated = False
+    for page in iter_pdf_pages(data):
+        if len(pages) >= max_pages or chars >= max_chars:
+            truncated = True
+            break
+        page = normalize_content(page)[:max_chars - chars]
+        pages.append(page)
+        chars += len(page)
+    return {"text": "\n\n".join(pages), "pages": len(pages), "truncated": truncated}
+
+
+def extract_pdf_file(path: str, max_pages: int = 50, max_chars: int = 200_000) -> Dict[str, Any]:
+    """extract_pdf_text over a file on disk, read through mmap rather than loaded whole."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return extract_pdf_text(data, max_pages, max_chars)
@@ -0,0 +1,433 @@
+"""Shared HTTP client - hedged requests, adaptive timeouts and per-host circuit breakers for document fetches
+
+One slow upstream host should not set the tail latency of the whole
+batch. For each host the client tracks recent response times and:
+- sends a duplicate (hedged) request once the first has taken longer than
+  the host's usual p95, and returns whichever answers first
+- times requests out at a multiple of the host's p99 instead of a fixed value
+- parks hosts that keep failing behind a circuit breaker
+
+Large documents (filing PDFs) use `download`, which streams into a NamedSpool
+(memory, then a named temp file) instead of returning the body as a string.
+"""
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import IO, Callable, Deque, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from . import budget
+except ImportError:
+    import budget
+
+
+class FetchError(Exception):
+    """Raised when a document could not be fetched."""
+
+
+class HostOpenError(FetchError):
+    """Raised without a request when the host's circuit breaker is open."""
+
+
+class LatencyTracker:
+    """Rolling window of response times per host."""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, latency: float) -> None:
+        with self._lock:
+            self._samples.setdefault(host, deque(maxlen=self.window)).append(latency)
+
+    def percentile(self, host: str, q: float) -> Optional[float]:
+        """q-th quantile (0-1) of the host's recent latencies; None until min_samples are in."""
+        with self._lock:
+            samples = sorted(self._samples.get(host, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failed fetches a host is open
+    (requests fail fast) for `cooldown` seconds, then half-open: one probe
+    is let through, closing the circuit on success and reopening it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.cooldown or self._probing.get(host):
+                return False
+            self._probing[host] = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._probing.pop(host, None) or self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+# Read size for streamed downloads
+CHUNK_BYTES = 64 * 1024
+
+
+class NamedSpool:
+    """
+    Download buffer: in memory up to max_size, then a named temp file.
+
+    Like tempfile.SpooledTemporaryFile, but once on disk the file has a
+    path (`name`, None while in memory), so a worker process can open it
+    directly instead of being handed a copy. Deleted on close.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.name: Optional[str] = None
+        self._file: IO[bytes] = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        if self.name is None and self._file.tell() + len(data) > self.max_size:
+            disk = tempfile.NamedTemporaryFile(suffix=".download")
+            disk.write(self._file.getvalue())
+            self._file, self.name = disk, disk.name
+        return self._file.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "NamedSpool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FakeDocumentServer:
+    """
+    Local stand-in for upstream document hosts.
+
+    Each request takes `base_latency`, or the host's entry in `slow_hosts`;
+    with probability `tail_probability` it takes `tail_latency` instead.
+    Requests longer than their timeout raise TimeoutError. `stream` serves
+    `document` in chunks for streamed downloads.
+    """
+
+    def __init__(
+        self,
+        base_latency: float = 0.4,
+        tail_probability: float = 0.0,
+        tail_latency: float = 5.0,
+        slow_hosts: Optional[Dict[str, float]] = None,
+        response: str = "",
+        document: bytes = b"",
+    ):
+        self.base_latency = base_latency
+        self.tail_probability = tail_probability
+        self.tail_latency = tail_latency
+        self.slow_hosts = slow_hosts or {}
+        self.response = response
+        self.document = document
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, url: str, timeout: float) -> str:
+        with self._lock:
+            self.calls += 1
+        latency = self.slow_hosts.get(urlparse(url).netloc, self.base_latency)
+        if random.random() < self.tail_probability:
+            latency = self.tail_latency
+        if latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"GET {url} timed out after {timeout:.1f}s")
+        time.sleep(latency)
+        return self.response
+
+    def stream(self, url: str, timeout: float) -> Iterator[bytes]:
+        self(url, timeout)
+        for start in range(0, len(self.document), CHUNK_BYTES):
+            yield self.document[start:start + CHUNK_BYTES]
+
+
+def urllib_backend(url: str, timeout: float) -> str:
+    """Plain GET through urllib."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset, errors="replace")
+
+
+def urllib_stream_backend(url: str, timeout: float) -> Iterator[bytes]:
+    """Streamed GET through urllib, in CHUNK_BYTES reads."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        while True:
+            chunk = response.read(CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+class HttpClient:
+    """
+    Hedged GETs with per-host adaptive timeouts and circuit breaking.
+
+    A request is hedged once it has run past the host's `hedge_quantile`
+    latency (bounded by min/max_hedge_delay). Hedges are capped at
+    `hedge_ratio` of requests (0 disables hedging) so a slow host is not hit with double load,
+    and are shed first near the run's deadline. The timeout is
+    `timeout_multiplier` x the host's p99, bounded by min/max_timeout and
+    by the time the run has left.
+    """
+
+    def __init__(
+        self,
+        backend: Callable[[str, float], str],
+        stream_backend: Optional[Callable[[str, float], Iterator[bytes]]] = None,
+        hedge_quantile: float = 0.95,
+        min_hedge_delay: float = 0.05,
+        max_hedge_delay: float = 2.0,
+        hedge_ratio: float = 0.1,
+        timeout_multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 30.0,
+        tracker: Optional[LatencyTracker] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_workers: int = 32,
+    ):
+        self.backend = backend
+        self.stream_backend = stream_backend or (lambda url, timeout: iter([backend(url, timeout).encode("utf-8")]))
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.hedge_ratio = hedge_ratio
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.tracker = tracker or LatencyTracker()
+        self.breaker = breaker or CircuitBreaker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+
+    def hedge_delay(self, host: str) -> float:
+        p = self.tracker.percentile(host, self.hedge_quantile)
+        if p is None:
+            return self.max_hedge_delay
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p))
+
+    def timeout(self, host: str) -> float:
+        p99 = self.tracker.percentile(host, 0.99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            # A ratio of 0 disables hedging; otherwise allow one hedge before the ratio applies
+            if self.hedge_ratio <= 0 or self.hedges + 1 > max(1.0, self.hedge_ratio * self.requests):
+                return False
+            self.hedges += 1
+            return True
+
+    def _attempt(self, url: str, host: str, timeout: float) -> str:
+        start = time.monotonic()
+        try:
+            body = self.backend(url, timeout)
+        except TimeoutError:
+            # A timed-out request still says how slow the host is
+            self.tracker.record(host, timeout)
+            raise
+        self.tracker.record(host, time.monotonic() - start)
+        return body
+
+    def get(self, url: str) -> str:
+        """
+        Fetch a URL, hedging slow requests.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Response body
+
+        Raises:
+            HostOpenError: The host's circuit breaker is open
+            FetchError: Every attempt failed or timed out
+            budget.BudgetExceeded: The run is out of time
+        """
+        host = urlparse(url).netloc
+        # Before allow(): a half-open host's probe must not be taken by a call that is then shed
+        timeout = budget.current().call_timeout(self.timeout(host))
+        if not self.breaker.allow(host):
+            raise HostOpenError(f"Circuit open for {host}, skipping {url}")
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self.requests += 1
+
+        pending = {self._executor.submit(self._attempt, url, host, timeout)}
+        hedged = False
+        last_error: Optional[BaseException] = None
+        while pending:
+            # Before hedging, wait only the hedge delay; after, until the deadline
+            wait_for = deadline - time.monotonic()
+            if not hedged:
+                wait_for = min(wait_for, self.hedge_delay(host))
+            done, pending = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.breaker.record_success(host)
+                    return future.result()
+                last_error = future.exception()
+            if time.monotonic() >= deadline:
+                break
+            if not hedged and pending and not budget.current().should_shed(budget.LOW) and self._may_hedge():
+                hedged = True
+                pending.add(self._executor.submit(self._attempt, url, host, deadline - time.monotonic()))
+            elif not hedged and not pending:
+                break
+
+        self.breaker.record_failure(host)
+        if last_error is None:
+            raise FetchError(f"GET {url} timed out after {timeout:.1f}s")
+        raise FetchError(f"GET {url} failed: {last_error}") from last_error
+
+    def download(self, url: str, max_bytes: int, spool_bytes: int = 1024 * 1024) -> Tuple[NamedSpool, int, bool]:
+        """
+        Stream a URL into a NamedSpool: in memory up to spool_bytes, in a
+        named temp file beyond. Not hedged - duplicating a large download
+        costs more than it saves.
+
+        Args:
+            url: URL to fetch
+            max_bytes: Stop reading (and mark truncated) past this size
+            spool_bytes: Size at which the file moves to disk
+
+        Returns:
+            (spool flushed and positioned at 0, bytes written, truncated); caller closes the spool
+
+        Raises:
+            HostOpenError: The host's circuit breaker is open
+            FetchError: The download failed or timed out
+            budget.BudgetExceeded: The run is out of time
+        """
+        host = urlparse(url).netloc
+        # Before allow(), as in get(): a shed call must not hold the half-open probe
+        timeout = budget.current().call_timeout(self.max_timeout)
+        if not self.breaker.allow(host):
+            raise HostOpenError(f"Circuit open for {host}, skipping {url}")
+        deadline = time.monotonic() + timeout
+        spool = NamedSpool(spool_bytes)
+        size = 0
+        truncated = False
+        chunks = self.stream_backend(url, timeout)
+        try:
+            for chunk in chunks:
+                if size + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - size]
+                    truncated = True
+                spool.write(chunk)
+                size += len(chunk)
+                if truncated:
+                    break
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"download exceeded {timeout:.1f}s")
+        except Exception as e:
+            spool.close()
+            self.breaker.record_failure(host)
+            raise FetchError(f"GET {url} failed: {e}") from e
+        finally:
+            # Release the connection when stopping early at max_bytes
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+        self.breaker.record_success(host)
+        spool.flush()
+        spool.seek(0)
+        return spool, size, truncated
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def _parse_slow_hosts(value: str) -> Dict[str, float]:
+    """Parse "host=seconds,host=seconds"."""
+    hosts = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        host, _, seconds = item.partition("=")
+        hosts[host] = float(seconds)
+    return hosts
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Dummy backend - in real implementation, would be urllib_backend / urllib_stream_backend
+                backend = FakeDocumentServer(
+                    base_latency=float(os.getenv("FAKE_HTTP_LATENCY", "0.4")),
+                    tail_probability=float(os.getenv("FAKE_HTTP_TAIL_PROBABILITY", "0")),
+                    tail_latency=float(os.getenv("FAKE_HTTP_TAIL_LATENCY", "5")),
+                    slow_hosts=_parse_slow_hosts(os.getenv("FAKE_HTTP_SLOW_HOSTS", "")),
+                )
+                _client = HttpClient(
+                    backend,
+                    stream_backend=backend.stream,
+                    hedge_quantile=float(os.getenv("HTTP_HEDGE_QUANTILE", "0.95")),
+                    hedge_ratio=float(os.getenv("HTTP_HEDGE_RATIO", "0.1")),
+                    max_timeout=float(os.getenv("HTTP_MAX_TIMEOUT", "30")),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv("HTTP_BREAKER_FAILURES", "5")),
+                        cooldown=float(os.getenv("HTTP_BREAKER_COOLDOWN", "30")),
+                    ),
+                    max_workers=int(os.getenv("HTTP_MAX_WORKERS", "32")),
+                )
+    return _client
+
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """Replace the process-wide client (e.g. with one backed by urllib_backend)."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,280 @@
+"""Shared LLM client - rate limiting and adaptive concurrency for all model calls"""
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from . import budget
+except ImportError:
+    import budget
+
+
+class ThrottlingError(Exception):
+    """Raised by a model backend when the request was throttled."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Refills continuously at `rate` units per second up to `capacity`.
+    `acquire` blocks until enough units are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount: float = 1.0) -> None:
+        # Requests larger than the bucket would never fit - let them drain it
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by one slot per window of successful calls and is cut
+    by `decrease_factor` on throttling or when latency rises well above
+    the observed baseline. One congestion event cuts the limit once: calls
+    already in flight when it was cut don't cut it again.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._baseline_latency: Optional[float] = None
+        self._decreased_at = float("-inf")
+        self._cond = threading.Condition()
+        self.throttle_backoffs = 0
+        self.latency_backoffs = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            # Calls sent before the last cut were sized by the old limit; their signal is already acted on
+            stale = latency is not None and time.monotonic() - latency < self._decreased_at
+            if throttled:
+                if not stale:
+                    self.throttle_backoffs += 1
+                    self._decrease()
+            elif latency is not None:
+                if self._baseline_latency is None:
+                    self._baseline_latency = latency
+                if latency > self._baseline_latency * self.latency_tolerance:
+                    if not stale:
+                        self.latency_backoffs += 1
+                        self._decrease()
+                elif not stale:
+                    self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+                # Baseline follows drops at once but rises slowly: the additive climb itself
+                # raises latency gradually, and a fast average would absorb that growth
+                self._baseline_latency = min(latency, 0.999 * self._baseline_latency + 0.001 * latency)
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        self._limit = max(self.minimum, self._limit * self.decrease_factor)
+        self._decreased_at = time.monotonic()
+
+
+class FakeModelServer:
+    """
+    Local stand-in for the model endpoint.
+
+    Simulates the throttling behaviour of the real service: requests beyond
+    `max_concurrency` in flight, or beyond `requests_per_second`, raise
+    ThrottlingError. Latency grows with load (in-flight / max_concurrency)
+    as base_latency * (1 + congestion * load^2): flat while lightly loaded,
+    several times the base near saturation, as a queueing backend behaves.
+    """
+
+    def __init__(
+        self,
+        base_latency: float = 0.5,
+        max_concurrency: int = 8,
+        requests_per_second: float = 20.0,
+        congestion: float = 3.0,
+        response: str = "",
+    ):
+        self.base_latency = base_latency
+        self.max_concurrency = max_concurrency
+        self.congestion = congestion
+        self.response = response
+        self._bucket = TokenBucket(requests_per_second, requests_per_second)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+
+    def __call__(self, prompt: str, max_tokens: int, timeout: float) -> str:
+        with self._lock:
+            self.calls += 1
+            if self._in_flight >= self.max_concurrency or not self._bucket.try_acquire():
+                self.throttled += 1
+                raise ThrottlingError("ThrottlingException: Too many requests")
+            self._in_flight += 1
+            load = self._in_flight / self.max_concurrency
+        try:
+            latency = self.base_latency * (1 + self.congestion * load ** 2)
+            if latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"Model call timed out after {timeout:.1f}s")
+            time.sleep(latency)
+            return self.response
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class LLMClient:
+    """
+    Single entry point for model calls shared by every agent.
+
+    Each call waits on the request and token buckets, then on the AIMD
+    concurrency limit, and retries throttled calls with jittered backoff.
+    Calls are checked against the current run's budget (budget.current()):
+    they get a timeout derived from the time left, are refused past the
+    LLM spend ceiling, and charge their tokens to the run.
+    """
+
+    def __init__(
+        self,
+        backend: Callable[[str, int, float], str],
+        requests_per_second: float = 10.0,
+        tokens_per_minute: float = 200_000,
+        controller: Optional[AIMDController] = None,
+        max_retries: int = 5,
+        call_timeout: float = 60.0,
+    ):
+        self.backend = backend
+        self.request_bucket = TokenBucket(requests_per_second, requests_per_second)
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute / 60.0 * 10)
+        self.controller = controller or AIMDController()
+        self.max_retries = max_retries
+        self.call_timeout = call_timeout
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        return len(prompt) // 4 + max_tokens
+
+    def invoke(self, prompt: str, max_tokens: int = 512) -> str:
+        """
+        Call the model, respecting shared rate and concurrency limits.
+
+        Args:
+            prompt: Prompt text
+            max_tokens: Output token budget for this call
+
+        Returns:
+            Model response text
+        
+        Raises:
+            budget.BudgetExceeded: The run is out of time or LLM budget
+        """
+        run_budget = budget.current()
+        tokens = self.estimate_tokens(prompt, max_tokens)
+        run_budget.check_llm(tokens)
+        for attempt in range(self.max_retries + 1):
+            self.request_bucket.acquire()
+            self.token_bucket.acquire(tokens)
+            self.controller.acquire()
+            start = time.monotonic()
+            try:
+                timeout = run_budget.call_timeout(self.call_timeout)
+                response = self.backend(prompt, max_tokens, timeout)
+            except ThrottlingError:
+                self.controller.release(latency=time.monotonic() - start, throttled=True)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(min(8.0, 0.2 * 2 ** attempt) * random.uniform(0.5, 1.5))
+                continue
+            except BaseException:
+                self.controller.release()
+                raise
+            self.controller.release(latency=time.monotonic() - start)
+            run_budget.charge(tokens)
+            return response
+        raise ThrottlingError("unreachable")
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLM client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Dummy backend - in real implementation, would wrap BedrockClient
+                backend = FakeModelServer(
+                    base_latency=float(os.getenv("FAKE_LLM_LATENCY", "0.5")),
+                    max_concurrency=int(os.getenv("FAKE_LLM_MAX_CONCURRENCY", "8")),
+                    requests_per_second=float(os.getenv("FAKE_LLM_REQUESTS_PER_SECOND", "20")),
+                )
+                _client = LLMClient(
+                    backend,
+                    requests_per_second=float(os.getenv("LLM_REQUESTS_PER_SECOND", "10")),
+                    tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "200000")),
+                    controller=AIMDController(
+                        initial=int(os.getenv("LLM_INITIAL_CONCURRENCY", "4")),
+                        minimum=int(os.getenv("LLM_MIN_CONCURRENCY", "1")),
+                        maximum=int(os.getenv("LLM_MAX_CONCURRENCY", "32")),
+                    ),
+                )
+    return _client
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Replace the process-wide client (e.g. with one backed by a FakeModelServer)."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,134 @@
+"""Logs - non-blocking structured logging for agents, tools and services
+
+Records are handed to a background QueueListener, so a log call on the hot
+path costs a level check (and, when enabled, a queue put) rather than a
+synchronous write to stdout. Output is one JSON object per line on stderr
+(LOG_FORMAT=text for humans), carrying the run, thread and entry IDs of the
+work that emitted it. LOG_LEVEL defaults to WARNING: quiet in production,
+LOG_LEVEL=INFO or DEBUG to follow each item.
+"""
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+LOGGER_NAME = "pipeline"
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+_CONTEXT_FIELDS = ("run_id", "thread_id", "entry_id", "node")
+
+_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("log_context", default={})
+
+
+class _ContextFilter(logging.Filter):
+    """Stamp the current context's IDs on each record (runs in the caller's thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if value is not None and not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message, context IDs and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                event[key] = value
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        ids = " ".join(f"{key}={getattr(record, key)}" for key in _CONTEXT_FIELDS if getattr(record, key, None))
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} {record.name} {record.getMessage()}"
+        if ids:
+            line += f" [{ids}]"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """
+    Route logging through a background queue; safe to call more than once.
+
+    Args:
+        level: Pipeline log level (default: LOG_LEVEL, else WARNING)
+        fmt: "json" or "text" (default: LOG_FORMAT, else json)
+    """
+    global _listener
+    level = (level or os.getenv("LOG_LEVEL", "WARNING")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    with _configure_lock:
+        logging.getLogger(LOGGER_NAME).setLevel(level)
+        if _listener is not None:
+            _listener.handlers[0].setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+            return
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(records)
+        handler.addFilter(_ContextFilter())
+        root = logging.getLogger()
+        root.addHandler(handler)
+        # Library logs stay at WARNING; LOG_LEVEL applies to the pipeline's own loggers
+        root.setLevel(logging.WARNING)
+        _listener = logging.handlers.QueueListener(records, output)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the pipeline namespace, e.g. get_logger("rss_agent")."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+@contextmanager
+def bind(**fields: Any) -> Iterator[None]:
+    """Add IDs (run_id, thread_id, entry_id, node, ...) to every record logged inside the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def set_fields(**fields: Any) -> None:
+    """Add IDs for the rest of the current context (e.g. entry_id once a node picks an entry)."""
+    _context.set({**_context.get(), **fields})
+
+
+def logged_node(name: str):
+    """Agent node decorator: bind the node name and the state's current entry (url) while it runs."""
+    def decorate(node):
+        @functools.wraps(node)
+        def wrapper(state):
+            with bind(node=name, entry_id=state.get("url")):
+                return node(state)
+        return wrapper
+    return decorate
@@ -1,8 +1,11 @@
 """Run LangGraph workflow demo - Supports RSS and API flows"""
 import asyncio
 import argparse
-from workflow import build_workflow
+import os
+from workflow import get_workflow
 from state import AgentState
+from budget import initial_budget_fields, start_job
+from logs import bind, configure_logging
 
 
 def create_initial_state(trigger_type: str = "rss", feed_url: str = None, feed_name: str = None) -> AgentState:
@@ -25,6 +28,8 @@ def create_initial_state(trigger_type: str = "rss", feed_url: str = None, feed_n
         "metadata": {},
         "pre_scraped_content": None,
         "classification": None,
+        "content_fingerprint": None,
+        "duplicate_of": None,
         "s3_key": None,
         "s3_bucket": None,
         "saved": False,
@@ -33,15 +38,22 @@ def create_initial_state(trigger_type: str = "rss", feed_url: str = None, feed_n
         "errors": [],
         "should_continue": True,
         "domain_queue_id": None,
-        "duplicate_check_enabled": False,
-        "skip_duplicate_check": True
+        "duplicate_check_enabled": True,
+        "skip_duplicate_check": False
     }
     
+    # Deadline and LLM budget (JOB_DEADLINE_SECONDS / LLM_BUDGET_USD)
+    state.update(initial_budget_fields())
+    
     # Add RSS-specific fields if RSS flow
     if trigger_type == "rss":
         state["feed_url"] = feed_url or "https://example.com/feed.rss"
         state["feed_name"] = feed_name or "default-feed"
     
+    # Add API-specific fields if API flow
+    if trigger_type == "api":
+        state["court_id"] = "scotus"
+    
     return state
 
 
@@ -66,7 +78,7 @@ async def run_workflow(trigger_type: str, feed_url: str = None, feed_name: str =
     print("\n" + "="*70)
     
     # Build workflow
-    app = build_workflow()
+    app = get_workflow()
     print(f"\n📊 Workflow Structure:")
     print(f"   Nodes: {list(app.nodes.keys())}")
     print(f"   Entry: scheduler")
@@ -80,8 +92,10 @@ async def run_workflow(trigger_type: str, feed_url: str = None, feed_name: str =
     print("🚀 Starting workflow execution...")
     print("="*70)
     
-    config = {"configurable": {"thread_id": f"{trigger_type}-demo-1"}}
-    final_state = await app.ainvoke(initial_state, config)
+    thread_id = f"{trigger_type}-demo-1"
+    config = {"configurable": {"thread_id": thread_id}}
+    with bind(thread_id=thread_id):
+        final_state = await app.ainvoke(initial_state, config)
     
     print("\n" + "="*70)
     print("📊 FINAL STATE SUMMARY")
@@ -103,6 +117,11 @@ async def run_workflow(trigger_type: str, feed_url: str = None, feed_name: str =
 
 async def main():
     """Main function - can run RSS, API, or all flows"""
+    # The demo follows each agent step in readable form by default
+    configure_logging(level=os.getenv("LOG_LEVEL", "INFO"), fmt=os.getenv("LOG_FORMAT", "text"))
+    # Every flow in this demo run shares one deadline and LLM budget
+    start_job()
+    
     parser = argparse.ArgumentParser(
         description="Run LangGraph multi-agent workflow demo",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -0,0 +1,119 @@
+"""
+Staged Pipeline - source, classification and storage as independent worker pools
+
+Alternative to the single-pass graph run: each stage pulls from a durable
+WorkQueue, runs its agent node, and pushes the updated state downstream.
+A slow LLM no longer stalls fetching, and finished classifications survive
+a storage failure or a restart.
+
+    [source] ─▶ source workers ─▶ [classify] ─▶ classification workers ─▶ [store] ─▶ storage workers
+"""
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional
+
+from logs import get_logger
+from state import AgentState
+from work_queue import WorkQueue, DEFAULT_QUEUE_PATH
+from agents.scheduler.agent import scheduler_node
+from agents.rss_agent.agent import rss_agent_node
+from agents.api_agent.agent import api_agent_node
+from agents.classification_agent.agent import classification_agent_node
+from agents.storage_agent.agent import storage_agent_node
+
+
+log = get_logger("staged")
+
+SOURCE_NODES: Dict[str, Callable[[AgentState], AgentState]] = {
+    "rss_agent": rss_agent_node,
+    "api_agent": api_agent_node,
+}
+
+IDLE_POLL_SECONDS = 0.2
+
+
+def run_source(state: AgentState) -> AgentState:
+    """Scheduler routing + source agent, same as the graph's first two hops."""
+    state = scheduler_node(state)
+    node = SOURCE_NODES.get(state.get("workflow_step"))
+    if node is None:
+        return state
+    return node(state)
+
+
+async def _put(queue: WorkQueue, payload: AgentState) -> None:
+    # Backpressure: wait for downstream to drain instead of growing the queue
+    while not queue.put(payload):
+        await asyncio.sleep(IDLE_POLL_SECONDS)
+
+
+async def _stage_worker(
+    name: str,
+    inbox: WorkQueue,
+    node: Callable[[AgentState], AgentState],
+    outbox: Optional[WorkQueue],
+    upstream_done: asyncio.Event,
+) -> None:
+    while True:
+        item = inbox.claim()
+        if item is None:
+            if upstream_done.is_set() and inbox.depth() == 0:
+                return
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+            continue
+        try:
+            state = await asyncio.to_thread(node, item["payload"])
+            if outbox is not None and state.get("should_continue", True):
+                await _put(outbox, state)
+            inbox.ack(item["id"])
+        except Exception as e:
+            retried = inbox.nack(item["id"], str(e))
+            log.error("[%s] item %s failed (%s): %s", name, item["id"], "retrying" if retried else "dead-lettered", e)
+
+
+async def _stage(name: str, workers: int, worker_args: tuple, upstream_done: asyncio.Event, done: asyncio.Event):
+    await asyncio.gather(*(_stage_worker(name, *worker_args, upstream_done) for _ in range(workers)))
+    done.set()
+
+
+async def run_staged(
+    initial_states: List[AgentState],
+    source_workers: int = 2,
+    classify_workers: int = 4,
+    storage_workers: int = 2,
+    path: Optional[str] = None,
+) -> None:
+    """
+    Run the staged pipeline until every queue has drained.
+
+    Items left unfinished by a previous run in the same queue file are
+    picked up again before the new ones; items it had leased are released
+    at once rather than after their lease expires.
+
+    Args:
+        initial_states: One initial state per source run
+        source_workers / classify_workers / storage_workers: Per-stage concurrency
+        path: Queue file (default WORK_QUEUE_PATH, then .cache/work_queue.sqlite)
+    """
+    path = path or os.getenv("WORK_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+    sources = WorkQueue("source", path)
+    classify = WorkQueue("classify", path)
+    store = WorkQueue("store", path)
+    # This run owns the file: leases still held are from a run that crashed
+    for queue in (sources, classify, store):
+        released = queue.reclaim_leases()
+        if released:
+            log.warning("Released %d items leased by an interrupted run from %s", released, queue.name)
+
+    for state in initial_states:
+        await _put(sources, state)
+
+    seeded, source_done, classify_done, storage_done = (asyncio.Event() for _ in range(4))
+    seeded.set()
+    await asyncio.gather(
+        _stage("source", source_workers, (sources, run_source, classify), seeded, source_done),
+        _stage("classification", classify_workers, (classify, classification_agent_node, store), source_done, classify_done),
+        _stage("storage", storage_workers, (store, storage_agent_node, None), classify_done, storage_done),
+    )
+    for queue in (sources, classify, store):
+        queue.purge_done()
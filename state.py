@@ -11,6 +11,10 @@ class AgentState(TypedDict, total=False):
     # RSS-specific fields
     feed_url: Optional[str]  # RSS feed URL
     feed_name: Optional[str]  # RSS feed name
+    feed_poll: Optional[Dict[str, Any]]  # {not_modified, entries: [{link, published}]} for adaptive polling
+    
+    # API-specific fields
+    court_id: Optional[str]  # CourtListener court identifier
     
     # Content
     url: Optional[str]
@@ -28,6 +32,10 @@ class AgentState(TypedDict, total=False):
     # Classification results
     classification: Optional[Dict[str, Any]]  # From InsuranceTagger.process_record()
     
+    # Near-duplicate detection
+    content_fingerprint: Optional[str]  # SimHash of content (hex)
+    duplicate_of: Optional[Dict[str, Any]]  # {url, s3_key, fingerprint, distance} of the original record
+    
     # Storage
     s3_key: Optional[str]
     s3_bucket: Optional[str]
@@ -45,4 +53,9 @@ class AgentState(TypedDict, total=False):
     # Optional flags
     duplicate_check_enabled: bool
     skip_duplicate_check: bool
+    
+    # Run budget (see budget.py)
+    deadline_at: Optional[float]  # Epoch seconds the run must finish by
+    llm_budget_usd: Optional[float]  # LLM spend ceiling for the run
+    llm_spent_usd: float
 
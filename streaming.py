@@ -0,0 +1,84 @@
+"""Streaming - emit per-node progress and stored records as JSON lines"""
+import json
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional, TextIO
+
+
+class JsonLinesSink:
+    """
+    Writes one JSON object per line and flushes each, so consumers can
+    tail the output while the run is still going.
+
+    Args:
+        path: File to append to; None writes to the process's stdout
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stream: TextIO = open(path, "a", encoding="utf-8") if path else sys.stdout
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def close(self) -> None:
+        if self.path:
+            self._stream.close()
+
+
+def _node_event(run_id: str, node: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "event": "node_complete",
+        "run_id": run_id,
+        "node": node,
+        "ts": time.time(),
+        "source": update.get("source"),
+        "url": update.get("url"),
+        "should_continue": update.get("should_continue"),
+        "errors": update.get("errors") or [],
+    }
+
+
+def _record_event(run_id: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "event": "record",
+        "run_id": run_id,
+        "ts": time.time(),
+        "s3_bucket": update.get("s3_bucket"),
+        "s3_key": update.get("s3_key"),
+        "source": update.get("source"),
+        "url": update.get("url"),
+        "title": update.get("title"),
+        "classification": update.get("classification"),
+        "duplicate_of": update.get("duplicate_of"),
+        "metadata": update.get("metadata"),
+    }
+
+
+async def stream_run(app, initial_state: Dict[str, Any], config: Dict[str, Any], sink: JsonLinesSink) -> Dict[str, Any]:
+    """
+    Run the graph with astream, emitting an event as each node completes
+    and a record event for every saved document.
+
+    Returns:
+        Final state (the last node's update merged over the initial state)
+    """
+    run_id = config["configurable"]["thread_id"]
+    final_state = dict(initial_state)
+    sink.emit({"event": "run_started", "run_id": run_id, "ts": time.time(),
+               "trigger_type": initial_state.get("trigger_type")})
+    async for chunk in app.astream(initial_state, config, stream_mode="updates"):
+        for node, update in chunk.items():
+            update = update or {}
+            final_state.update(update)
+            sink.emit(_node_event(run_id, node, update))
+            if node == "storage" and update.get("saved"):
+                sink.emit(_record_event(run_id, update))
+    sink.emit({"event": "run_finished", "run_id": run_id, "ts": time.time(),
+               "saved": final_state.get("saved"), "errors": final_state.get("errors") or []})
+    return final_state
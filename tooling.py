@@ -0,0 +1,38 @@
+"""Tooling - fast path for pure, synchronous helper tools
+
+`.invoke` on a LangChain tool builds a callback manager, validates the
+input against the tool's schema and fires run events - tens of
+microseconds per call. For pure helpers (no I/O, no side effects) that
+run once per feed entry, that overhead dominates the actual work.
+
+`pure_tool` registers a helper as a normal @tool (so agents and LLM tool
+calling still see it) and marks it pure; `run_tool` calls the underlying
+function directly for pure tools and falls back to `.invoke` otherwise.
+"""
+from typing import Any, Callable, Dict
+
+from langchain_core.tools import BaseTool, tool
+
+
+def pure_tool(func: Callable[..., Any]) -> BaseTool:
+    """@tool for pure, synchronous helpers; enables the run_tool fast path."""
+    registered = tool(func)
+    registered.metadata = {**(registered.metadata or {}), "pure": True}
+    return registered
+
+
+def is_pure(t: BaseTool) -> bool:
+    return bool(t.metadata and t.metadata.get("pure")) and getattr(t, "func", None) is not None
+
+
+def run_tool(t: BaseTool, args: Dict[str, Any]) -> Any:
+    """
+    Call a tool, skipping LangChain's callback/validation machinery for pure tools.
+
+    Args:
+        t: Tool to call
+        args: Tool arguments by name (same shape as for .invoke)
+    """
+    if is_pure(t):
+        return t.func(**args)
+    return t.invoke(args)
@@ -0,0 +1,196 @@
+"""Durable Work Queue - SQLite-backed queues connecting pipeline stages"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+DEFAULT_QUEUE_PATH = ".cache/work_queue.sqlite"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+class WorkQueue:
+    """
+    Named durable queue stored in a local SQLite file.
+
+    - `put` applies backpressure: it reports False while the queue holds
+      `max_depth` unfinished items
+    - `claim` leases the oldest available item; a lease that is not acked
+      in time (e.g. the process died) makes the item available again, and
+      counts as a failed attempt so an item that kills its worker is
+      eventually dead-lettered
+    - `ack` finishes an item; `nack` retries it with backoff, and moves it
+      to the dead-letter state after `max_attempts`
+
+    Several queues can share one file; each is identified by `name`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str = DEFAULT_QUEUE_PATH,
+        max_depth: int = 1000,
+        max_attempts: int = 3,
+        lease_seconds: float = 900.0,
+    ):
+        self.name = name
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_work_items_ready ON work_items (queue, status, available_at)"
+        )
+        self._conn.commit()
+
+    def depth(self) -> int:
+        """Unfinished items (pending or leased)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM work_items WHERE queue = ? AND status IN (?, ?)",
+                (self.name, PENDING, LEASED),
+            ).fetchone()[0]
+
+    def put(self, payload: Dict[str, Any]) -> bool:
+        """
+        Enqueue a payload unless the queue is full.
+
+        Returns:
+            True if enqueued, False if the caller should back off and retry
+        """
+        if self.depth() >= self.max_depth:
+            return False
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO work_items (queue, payload, status, available_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (self.name, json.dumps(payload), PENDING, now, now),
+            )
+            self._conn.commit()
+        return True
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next available item.
+
+        Returns:
+            Dictionary with id, attempts and payload, or None if nothing is ready
+        """
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    """
+                    SELECT id, status, attempts, payload FROM work_items
+                    WHERE queue = ? AND status IN (?, ?) AND available_at <= ?
+                    ORDER BY available_at, id LIMIT 1
+                    """,
+                    (self.name, PENDING, LEASED, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return None
+                item_id, status, attempts, payload = row
+                # A leased item is only claimable once its lease has expired
+                if status == LEASED:
+                    attempts += 1
+                    if not self._lease_lost(item_id, attempts):
+                        continue
+                self._conn.execute(
+                    "UPDATE work_items SET status = ?, available_at = ? WHERE id = ?",
+                    (LEASED, now + self.lease_seconds, item_id),
+                )
+                self._conn.commit()
+                return {"id": item_id, "attempts": attempts, "payload": json.loads(payload)}
+
+    def _lease_lost(self, item_id: int, attempts: int) -> bool:
+        """Record an unacked lease as failed attempt `attempts`; caller holds the lock and commits."""
+        retry = attempts < self.max_attempts
+        self._conn.execute(
+            "UPDATE work_items SET status = ?, attempts = ?, available_at = ?, last_error = ? WHERE id = ?",
+            (PENDING if retry else DEAD, attempts, time.time(), "lease expired", item_id),
+        )
+        return retry
+
+    def reclaim_leases(self) -> int:
+        """
+        Release every leased item now instead of when its lease expires.
+
+        Only safe when no other process is working this queue, e.g. at the
+        start of a run that owns the file: leases left behind are from a
+        worker that died. Each counts as a failed attempt.
+
+        Returns:
+            Items released
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, attempts FROM work_items WHERE queue = ? AND status = ?", (self.name, LEASED)
+            ).fetchall()
+            for item_id, attempts in rows:
+                self._lease_lost(item_id, attempts + 1)
+            self._conn.commit()
+        return len(rows)
+
+    def ack(self, item_id: int) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE work_items SET status = ? WHERE id = ?", (DONE, item_id))
+            self._conn.commit()
+
+    def nack(self, item_id: int, error: str) -> bool:
+        """
+        Return an item for retry with exponential backoff.
+
+        Returns:
+            True if it will be retried, False if it was dead-lettered
+        """
+        with self._lock:
+            attempts = self._conn.execute(
+                "SELECT attempts FROM work_items WHERE id = ?", (item_id,)
+            ).fetchone()[0] + 1
+            retry = attempts < self.max_attempts
+            self._conn.execute(
+                "UPDATE work_items SET status = ?, attempts = ?, available_at = ?, last_error = ? WHERE id = ?",
+                (
+                    PENDING if retry else DEAD,
+                    attempts,
+                    time.time() + min(60.0, 2.0 ** attempts),
+                    error,
+                    item_id,
+                ),
+            )
+            self._conn.commit()
+        return retry
+
+    def purge_done(self) -> int:
+        """Delete acknowledged items. Returns rows removed."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM work_items WHERE queue = ? AND status = ?", (self.name, DONE)
+            ).rowcount
+            self._conn.commit()
+        return removed
@@ -0,0 +1,391 @@
+"""Worker Service - long-running warm worker that accepts run requests
+
+One process keeps the compiled graph and every shared client, pool and
+cache warm, and runs requests arriving from any of:
+- a queue directory: JSON request files dropped into the directory
+- a Unix socket: one JSON request per line, one JSON result line back
+- a small HTTP endpoint: POST /runs, GET /healthz
+
+A request is {"trigger_type": "rss" | "api", "params": {...}, "id": "..."};
+params name the source (feed_url and feed_name for rss, court_id for api)
+and are merged into the initial state. Any other key is rejected, so a
+caller cannot set internal state such as the deadline, budget or bucket.
+On SIGTERM/SIGINT intake stops and queued and in-flight runs drain.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from agents.scheduler import SourceJob
+from logs import bind, get_logger
+
+
+log = get_logger("worker_service")
+
+JobRunner = Callable[[SourceJob], Awaitable[Optional[Dict[str, Any]]]]
+
+# Source parameters a request may set, per trigger type
+SOURCE_PARAMS = {
+    "rss": ("feed_url", "feed_name"),
+    "api": ("court_id",),
+}
+TRIGGER_TYPES = tuple(SOURCE_PARAMS)
+POLL_SECONDS = 0.2
+
+
+class ServiceDraining(Exception):
+    """Raised when a request arrives after shutdown has begun."""
+
+
+def parse_request(request: Dict[str, Any]) -> SourceJob:
+    """
+    Build the job for a run request.
+
+    Raises:
+        ValueError: Malformed request
+    """
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    trigger_type = request.get("trigger_type")
+    if trigger_type not in TRIGGER_TYPES:
+        raise ValueError(f"trigger_type must be one of {TRIGGER_TYPES}, got {trigger_type!r}")
+    params = request.get("params") or {}
+    if not isinstance(params, dict):
+        raise ValueError("params must be a JSON object")
+    allowed = SOURCE_PARAMS[trigger_type]
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise ValueError(f"unsupported params for {trigger_type}: {unknown} (allowed: {list(allowed)})")
+    for key, value in params.items():
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"params.{key} must be a non-empty string")
+    return SourceJob(job_id=str(request.get("id") or uuid.uuid4().hex), trigger_type=trigger_type, params=params)
+
+
+def summarize(job: SourceJob, state: Optional[Dict[str, Any]], started: float, error: Optional[str] = None) -> Dict[str, Any]:
+    state = state or {}
+    return {
+        "id": job.job_id,
+        "trigger_type": job.trigger_type,
+        "ok": error is None,
+        "saved": bool(state.get("saved")),
+        "s3_bucket": state.get("s3_bucket"),
+        "s3_key": state.get("s3_key"),
+        "url": state.get("url"),
+        "errors": state.get("errors") or ([error] if error else []),
+        "duration_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+class WorkerService:
+    """
+    Bounded queue of run requests served by `workers` concurrent graph runs.
+
+    Intakes call `enqueue`, which waits while `max_pending` requests are
+    already queued, so a burst applies backpressure instead of piling up.
+    """
+
+    def __init__(self, run_job: JobRunner, workers: int = 4, max_pending: int = 100, job_timeout: float = 900.0):
+        self.run_job = run_job
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self._queue: "asyncio.Queue" = asyncio.Queue(max_pending)
+        self.accepting = True
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "ok" if self.accepting else "draining",
+            "queued": self._queue.qsize(),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def enqueue(self, job: SourceJob) -> "asyncio.Future":
+        """Queue a job; the returned future resolves to its result summary."""
+        if not self.accepting:
+            raise ServiceDraining("worker is shutting down")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return future
+
+    async def _worker(self) -> None:
+        while True:
+            job, future = await self._queue.get()
+            self.in_flight += 1
+            started = time.monotonic()
+            try:
+                with bind(job_id=job.job_id):
+                    state = await asyncio.wait_for(self.run_job(job), timeout=self.job_timeout)
+                result = summarize(job, state, started)
+                self.completed += 1
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = TimeoutError(f"run exceeded {self.job_timeout}s")
+                log.error("%s failed: %s", job.job_id, e)
+                result = summarize(job, None, started, error=str(e))
+                self.failed += 1
+            finally:
+                self.in_flight -= 1
+            log.info("%s finished in %.0f ms", job.job_id, result["duration_ms"], extra={"ok": result["ok"]})
+            # Hand the result over before the drain can see the queue as empty
+            if not future.done():
+                future.set_result(result)
+            self._queue.task_done()
+
+    async def run(self, stop: asyncio.Event, intakes: List[Callable[["WorkerService", asyncio.Event], Awaitable[None]]],
+                  drain_timeout: float = 25.0) -> None:
+        """
+        Serve until `stop` is set, then stop intake and drain.
+
+        Args:
+            stop: Event that starts shutdown
+            intakes: Coroutine functions (service, stop) that feed requests until stop is set
+            drain_timeout: Seconds to wait for queued and in-flight runs before giving up
+        """
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        intake_tasks = [asyncio.create_task(intake(self, stop)) for intake in intakes]
+        await stop.wait()
+        self.accepting = False
+        log.info("Draining: %d queued, %d in flight", self._queue.qsize(), self.in_flight)
+        try:
+            # Intakes stop accepting and wait for the results they owe callers
+            await asyncio.wait_for(asyncio.gather(self._queue.join(), *intake_tasks), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            log.error("Drain timed out after %ss with %d runs unfinished",
+                      drain_timeout, self._queue.qsize() + self.in_flight)
+        finally:
+            for task in workers + intake_tasks:
+                task.cancel()
+            await asyncio.gather(*workers, *intake_tasks, return_exceptions=True)
+
+
+async def _stopped(stop: asyncio.Event, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    return stop.is_set()
+
+
+def queue_dir_intake(path: str):
+    """
+    Intake that runs JSON request files dropped into `path`.
+
+    Files are claimed by an atomic rename into `.processing/`, so several
+    workers can share one directory. Results are written to `done/` (or
+    `failed/`) under the request's file name. Files left in `.processing/`
+    by a killed worker are picked up again on the next start.
+    """
+    incoming = Path(path)
+    processing, done, failed = incoming / ".processing", incoming / "done", incoming / "failed"
+
+    async def finish(name: str, claimed: Path, job: Optional[SourceJob], future, error: Optional[str] = None):
+        if future is not None:
+            result = await future
+        else:
+            result = {"id": name, "ok": False, "errors": [error]}
+        (done if result["ok"] else failed).joinpath(name).write_text(json.dumps(result, default=str))
+        claimed.unlink(missing_ok=True)
+
+    async def intake(service: WorkerService, stop: asyncio.Event) -> None:
+        for directory in (processing, done, failed):
+            directory.mkdir(parents=True, exist_ok=True)
+        for orphan in processing.glob("*.json"):
+            orphan.rename(incoming / orphan.name)
+        log.info("Watching queue directory %s", incoming)
+        pending = set()
+        while not stop.is_set():
+            for request_file in sorted(incoming.glob("*.json")):
+                if stop.is_set():
+                    break
+                claimed = processing / request_file.name
+                try:
+                    request_file.rename(claimed)
+                except FileNotFoundError:
+                    continue  # Another worker claimed it
+                try:
+                    job = parse_request(json.loads(claimed.read_text()))
+                except ValueError as e:  # json.JSONDecodeError is a ValueError
+                    pending.add(asyncio.create_task(finish(claimed.name, claimed, None, None, str(e))))
+                    continue
+                future = await service.enqueue(job)
+                pending.add(asyncio.create_task(finish(claimed.name, claimed, job, future)))
+            pending = {task for task in pending if not task.done()}
+            await _stopped(stop, POLL_SECONDS)
+        await asyncio.gather(*pending)
+
+    intake.endpoint = f"queue dir {incoming}"
+    return intake
+
+
+class _Connections:
+    """Open server connections, so shutdown can close idle ones and wait for busy ones."""
+
+    def __init__(self):
+        self._busy: Dict["asyncio.Task", bool] = {}
+
+    @contextmanager
+    def track(self):
+        task = asyncio.current_task()
+        self._busy[task] = False
+        try:
+            yield
+        finally:
+            self._busy.pop(task, None)
+
+    @contextmanager
+    def busy(self):
+        task = asyncio.current_task()
+        self._busy[task] = True
+        try:
+            yield
+        finally:
+            if task in self._busy:
+                self._busy[task] = False
+
+    async def close(self) -> None:
+        for task, busy in list(self._busy.items()):
+            if not busy:
+                task.cancel()
+        await asyncio.gather(*self._busy, return_exceptions=True)
+
+
+def unix_socket_intake(path: str):
+    """Intake reading one JSON request per line from a Unix socket, answering each with a JSON result line."""
+
+    async def intake(service: WorkerService, stop: asyncio.Event) -> None:
+        connections = _Connections()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            with connections.track():
+                try:
+                    while not stop.is_set():
+                        line = await reader.readline()
+                        if not line:
+                            break
+                        with connections.busy():
+                            try:
+                                future = await service.enqueue(parse_request(json.loads(line)))
+                                result = await future
+                            except (ValueError, ServiceDraining) as e:
+                                result = {"ok": False, "errors": [str(e)]}
+                            writer.write(json.dumps(result, default=str).encode("utf-8") + b"\n")
+                            await writer.drain()
+                except ConnectionError:
+                    pass
+                finally:
+                    writer.close()
+
+        Path(path).unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(handle, path=path)
+        log.info("Listening on unix socket %s", path)
+        await stop.wait()
+        server.close()
+        await connections.close()
+        Path(path).unlink(missing_ok=True)
+
+    intake.endpoint = f"unix socket {path}"
+    return intake
+
+
+_HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def http_intake(host: str, port: int):
+    """
+    Intake serving a minimal HTTP/1.1 endpoint:
+    - POST /runs with a JSON request body runs it and returns the result
+    - GET /healthz returns queue and run counters (503 while draining)
+    """
+
+    async def respond(writer: asyncio.StreamWriter, code: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, default=str).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {code} {_HTTP_REASONS[code]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("ascii") + payload
+        )
+        await writer.drain()
+
+    async def intake(service: WorkerService, stop: asyncio.Event) -> None:
+        connections = _Connections()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            with connections.track():
+                try:
+                    request_line = (await reader.readline()).decode("latin-1").split()
+                    with connections.busy():
+                        await serve(request_line, reader, writer)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    pass
+                finally:
+                    writer.close()
+
+        async def serve(request_line: List[str], reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return await respond(writer, 400, {"error": "malformed request line"})
+            method, target = request_line[0], request_line[1].split("?")[0]
+            if target == "/healthz":
+                status = service.status()
+                return await respond(writer, 200 if service.accepting else 503, status)
+            if target != "/runs":
+                return await respond(writer, 404, {"error": f"no route for {target}"})
+            if method != "POST":
+                return await respond(writer, 405, {"error": "use POST"})
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError("negative Content-Length")
+                if length > MAX_BODY_BYTES:
+                    return await respond(writer, 413, {"error": "request body too large"})
+                job = parse_request(json.loads(await reader.readexactly(length)))
+            except ValueError as e:
+                return await respond(writer, 400, {"error": str(e)})
+            try:
+                result = await (await service.enqueue(job))
+            except ServiceDraining as e:
+                return await respond(writer, 503, {"error": str(e)})
+            await respond(writer, 200 if result["ok"] else 500, result)
+
+        server = await asyncio.start_server(handle, host=host, port=port)
+        log.info("Listening on http://%s:%d", host, port)
+        await stop.wait()
+        # Stop accepting connections; requests already being served finish during the drain
+        server.close()
+        await connections.close()
+
+    intake.endpoint = f"http://{host}:{port}"
+    return intake
+
+
+def build_intakes(queue_dir: Optional[str] = None, socket_path: Optional[str] = None,
+                  http_port: Optional[int] = None, http_host: str = "127.0.0.1") -> list:
+    """Intakes for the configured endpoints (arguments fall back to WORKER_QUEUE_DIR / WORKER_SOCKET / WORKER_HTTP_PORT)."""
+    queue_dir = queue_dir or os.getenv("WORKER_QUEUE_DIR")
+    socket_path = socket_path or os.getenv("WORKER_SOCKET")
+    http_port = http_port if http_port is not None else (int(os.getenv("WORKER_HTTP_PORT")) if os.getenv("WORKER_HTTP_PORT") else None)
+    intakes = []
+    if queue_dir:
+        intakes.append(queue_dir_intake(queue_dir))
+    if socket_path:
+        intakes.append(unix_socket_intake(socket_path))
+    if http_port is not None:
+        intakes.append(http_intake(http_host, http_port))
+    return intakes
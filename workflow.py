@@ -1,27 +1,45 @@
 """LangGraph Workflow - Multi-Agent Flow with Scheduler"""
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+import functools
+import importlib
 import sys
 from pathlib import Path
 
 # Handle imports
 try:
     from .state import AgentState
-    from .agents.scheduler.agent import scheduler_node
-    from .agents.rss_agent.agent import rss_agent_node
-    from .agents.api_agent.agent import api_agent_node
-    from .agents.classification_agent.agent import classification_agent_node
-    from .agents.storage_agent.agent import storage_agent_node
+    _AGENTS_PACKAGE = f"{__package__}.agents"
 except ImportError:
     parent_dir = str(Path(__file__).parent)
     if parent_dir not in sys.path:
         sys.path.insert(0, parent_dir)
     from state import AgentState
-    from agents.scheduler.agent import scheduler_node
-    from agents.rss_agent.agent import rss_agent_node
-    from agents.api_agent.agent import api_agent_node
-    from agents.classification_agent.agent import classification_agent_node
-    from agents.storage_agent.agent import storage_agent_node
+    _AGENTS_PACKAGE = "agents"
+
+
+def _lazy_node(module: str, name: str):
+    """
+    Node that imports its agent (and the agent's tools) on first run.
+    Building the graph stays cheap, and a run only loads the agents it visits.
+    """
+    @functools.lru_cache(maxsize=None)
+    def resolve():
+        return getattr(importlib.import_module(f"{_AGENTS_PACKAGE}.{module}"), name)
+    
+    def node(state: AgentState) -> AgentState:
+        return resolve()(state)
+    
+    node.__name__ = name
+    node.resolve = resolve
+    return node
+
+
+scheduler_node = _lazy_node("scheduler.agent", "scheduler_node")
+rss_agent_node = _lazy_node("rss_agent.agent", "rss_agent_node")
+api_agent_node = _lazy_node("api_agent.agent", "api_agent_node")
+classification_agent_node = _lazy_node("classification_agent.agent", "classification_agent_node")
+storage_agent_node = _lazy_node("storage_agent.agent", "storage_agent_node")
 
 
 def route_to_source_agent(state: AgentState) -> str:
@@ -98,6 +116,24 @@ def build_workflow():
     return app
 
 
+@functools.lru_cache(maxsize=1)
+def get_workflow():
+    """
+    Compiled workflow shared by every run in this process.
+    Runs are isolated by their thread_id, so one graph serves them all.
+    """
+    return build_workflow()
+
+
+def preload_agents() -> None:
+    """
+    Import every agent now instead of on first visit.
+    Long-lived workers call this at startup so the first request doesn't pay for it.
+    """
+    for node in (scheduler_node, rss_agent_node, api_agent_node, classification_agent_node, storage_agent_node):
+        node.resolve()
+
+
 if __name__ == "__main__":
     app = build_workflow()
     print("✅ LangGraph workflow built successfully!")